@@ -2,19 +2,30 @@
 
 from __future__ import annotations
 
+import array
+import html
 import io
+import itertools
 import json
+import math
 import os
+import re
 import sys
 import importlib
 import importlib.util
-import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from functools import lru_cache
-from collections import defaultdict
 from dataclasses import dataclass, replace as dataclass_replace
 from pathlib import Path
-from typing import Any, Sequence
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterator, Literal, Mapping, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover - type checking only
+    import plotly.graph_objects as go
+    import pretty_midi
 
 
 OPTIONAL_FAILURES_ENV_VAR = "LOFI_SYMPHONY_OPTIONAL_FAILURES"
@@ -36,18 +47,15 @@ def _optional_installation_failures() -> list[str]:
     return []
 
 
+def _probable_package_name() -> str:
+    """Cheaply guess the package name from the directory holding this file."""
 
+    return os.path.basename(os.path.dirname(os.path.abspath(__file__)))
 
-if __package__ in {None, ""}:  # pragma: no cover - defensive import guard
-    # Allow running ``python -m streamlit run lofi_symphony/app.py`` without
-    # installation by deriving the package context from the file location. The
-    # resolved path stays within the current process and is never exposed
-    # externally.
-    from pathlib import Path
-    from types import ModuleType
 
-    module = sys.modules[__name__]
-    package_dir = Path(__file__).resolve().parent
+@lru_cache(maxsize=None)
+def _discover_package_context(package_dir: Path) -> tuple[str, str]:
+    """Return the dotted package name and ``sys.path`` root for ``package_dir``."""
 
     package_parts: list[str] = []
     search_root = package_dir
@@ -59,8 +67,25 @@ if __package__ in {None, ""}:  # pragma: no cover - defensive import guard
         package_name = package_dir.name
     else:
         package_name = ".".join(reversed(package_parts))
+    return package_name, str(search_root)
+
+
+if __package__ in {None, ""} and f"{_probable_package_name()}.app" in sys.modules:  # pragma: no cover
+    # Streamlit re-executes the script by file path on every rerun. Once the
+    # canonical module is registered the package is already importable, so skip
+    # the importlib machinery below and only restore the package context.
+    __package__ = _probable_package_name()
+elif __package__ in {None, ""}:  # pragma: no cover - defensive import guard
+    # Allow running ``python -m streamlit run lofi_symphony/app.py`` without
+    # installation by deriving the package context from the file location. The
+    # resolved path stays within the current process and is never exposed
+    # externally.
+    from types import ModuleType
+
+    module = sys.modules[__name__]
+    package_dir = Path(__file__).resolve().parent
+    package_name, sys_path_entry = _discover_package_context(package_dir)
 
-    sys_path_entry = str(search_root)
     if sys_path_entry not in sys.path:
         sys.path.insert(0, sys_path_entry)
 
@@ -98,9 +123,7 @@ if __package__ in {None, ""}:  # pragma: no cover - defensive import guard
         except Exception:
             pass
 
-import pandas as pd
-import plotly.graph_objects as go
-import pretty_midi
+import numpy as np
 import streamlit as st
 
 from lofi_symphony.audiocraft_integration import (
@@ -109,7 +132,7 @@ from lofi_symphony.audiocraft_integration import (
     AudiocraftUnavailable,
     clear_cached_musicgen,
     ensure_musicgen_assets,
-    generate_musicgen_backing,
+    musicgen_backing_wav_bytes,
     render_musicgen,
 )
 from lofi_symphony.fluidsynth_assets import (
@@ -121,12 +144,15 @@ from lofi_symphony.fluidsynth_assets import (
 )
 from lofi_symphony.generator import (
     AVAILABLE_INSTRUMENTS,
+    INSTRUMENT_PROGRAMS,
     MOOD_TEMPO,
     TYPE_INSTRUMENTS,
     TYPE_PROGRESSIONS,
     SectionArrangement,
+    audio_to_wav_bytes,
     generate_lofi_midi,
     generate_structured_song,
+    in_process_rendering_available,
     midi_to_audio,
 )
 from lofi_symphony.midi_input import MidiBackendUnavailable, MidiInputManager, MidiMessage
@@ -141,6 +167,11 @@ SCALE_INTERVALS: dict[str, tuple[int, ...]] = {
 }
 
 
+_PROGRESSION_POOLS = {palette: tuple(pool) for palette, pool in TYPE_PROGRESSIONS.items()}
+_DEFAULT_PROGRESSION_POOL = _PROGRESSION_POOLS["Chillhop"]
+_PROGRESSION_RNG = np.random.default_rng()
+
+
 KEYBOARD_OCTAVES = (
     {
         "label": "Octave 3",
@@ -154,8 +185,18 @@ KEYBOARD_OCTAVES = (
     },
 )
 
+_PITCH_CLASS_OFFSETS = {
+    "C": 0, "C#": 1, "D": 2, "D#": 3, "E": 4, "F": 5, "F#": 6, "G": 7, "G#": 8, "A": 9, "A#": 10, "B": 11,
+}
+# MIDI numbers for every on-screen key so presses skip pretty_midi's note-name parser.
+_KEYBOARD_PITCHES = {
+    note: 12 * (int(note[-1]) + 1) + _PITCH_CLASS_OFFSETS[note[:-1]]
+    for octave in KEYBOARD_OCTAVES
+    for note in (*octave["white"], *octave["accidentals"].values())
+}
+
 
-WORKFLOW_GUIDE_STEPS = [
+WORKFLOW_GUIDE_STEPS = (
     {
         "title": "Generator",
         "highlight": "Dial in key, scale, palette and mood to seed harmonic DNA.",
@@ -176,7 +217,12 @@ WORKFLOW_GUIDE_STEPS = [
         "highlight": "Quantize, edit clips directly and render polished stems.",
         "details": "Export MIDI, WAV and JSON when you are happy with the structure.",
     },
-]
+)
+
+_WORKFLOW_STEPS_HTML = "".join(
+    f'<div class="workflow-step"><h4>{step["title"]}</h4><span>{step["highlight"]}</span><p>{step["details"]}</p></div>'
+    for step in WORKFLOW_GUIDE_STEPS
+)
 
 
 MUSICGEN_MODEL_CHOICES: tuple[tuple[str, str], ...] = (
@@ -188,73 +234,81 @@ MUSICGEN_MODEL_CHOICES: tuple[tuple[str, str], ...] = (
 _MUSICGEN_MODEL_LABELS = {model: label for model, label in MUSICGEN_MODEL_CHOICES}
 
 
-@lru_cache(maxsize=1)
 def _fluidsynth_available() -> bool:
-    return resolve_fluidsynth_executable() is not None
+    return in_process_rendering_available() or resolve_fluidsynth_executable() is not None
 
 
-@lru_cache(maxsize=1)
 def _soundfont_available() -> bool:
     return resolve_soundfont_path(None) is not None
 
 
-DEFAULT_ARRANGER_TRACKS = [
-    {
-        "name": "Chords",
-        "role": "Harmonic bed",
-        "instrument": "Rhodes",
-        "enabled": True,
-        "volume": 82,
-        "pan": 0,
-        "color": "#a855f7",
-    },
-    {
-        "name": "Melody",
-        "role": "Lead phrases",
-        "instrument": "Synth",
-        "enabled": True,
-        "volume": 74,
-        "pan": -8,
-        "color": "#22d3ee",
-    },
-    {
-        "name": "Bass",
-        "role": "Low-end groove",
-        "instrument": "Bass",
-        "enabled": True,
-        "volume": 78,
-        "pan": 6,
-        "color": "#ec4899",
-    },
-    {
-        "name": "Drums",
-        "role": "Rhythm kit",
-        "instrument": "Drums",
-        "enabled": True,
-        "volume": 70,
-        "pan": 0,
-        "color": "#f97316",
-    },
-    {
-        "name": "Textures",
-        "role": "FX layers",
-        "instrument": "FX",
-        "enabled": False,
-        "volume": 52,
-        "pan": 18,
-        "color": "#c084fc",
-    },
-]
+DEFAULT_ARRANGER_TRACKS: tuple[MappingProxyType[str, Any], ...] = (
+    MappingProxyType(
+        {
+            "name": "Chords",
+            "role": "Harmonic bed",
+            "instrument": "Rhodes",
+            "enabled": True,
+            "volume": 82,
+            "pan": 0,
+            "color": "#a855f7",
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "Melody",
+            "role": "Lead phrases",
+            "instrument": "Synth",
+            "enabled": True,
+            "volume": 74,
+            "pan": -8,
+            "color": "#22d3ee",
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "Bass",
+            "role": "Low-end groove",
+            "instrument": "Bass",
+            "enabled": True,
+            "volume": 78,
+            "pan": 6,
+            "color": "#ec4899",
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "Drums",
+            "role": "Rhythm kit",
+            "instrument": "Drums",
+            "enabled": True,
+            "volume": 70,
+            "pan": 0,
+            "color": "#f97316",
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "Textures",
+            "role": "FX layers",
+            "instrument": "FX",
+            "enabled": False,
+            "volume": 52,
+            "pan": 18,
+            "color": "#c084fc",
+        }
+    ),
+)
 
 
-EFFECT_PRESETS = [
+EFFECT_PRESETS = (
     "Tape Warmth",
     "Vinyl Crackle",
     "Lush Chorus",
     "Stereo Spread",
     "Dusty Reverb",
     "Lo-Fi Delay",
-]
+)
 
 
 ARRANGER_AUTOMATION_DEFAULT = 100
@@ -309,7 +363,7 @@ class SessionSettings:
     mood: str
     tempo: int
     rhythm: str
-    instruments: Sequence[str]
+    instruments: tuple[str, ...]
     vinyl_fx: bool
 
     def tonality(self) -> str:
@@ -361,8 +415,9 @@ def _soundfont_library_panel() -> None:
                         )
                     else:
                         saved_path_str = str(saved_path)
-                        _soundfont_available.cache_clear()
                         _note_preview_audio.cache_clear()
+                        _timeline_renders().clear()
+                        _render_midi_to_wav.clear()
                         if auto_activate:
                             previous_override = os.getenv(SOUNDFONT_ENV_VAR)
                             os.environ[SOUNDFONT_ENV_VAR] = saved_path_str
@@ -411,8 +466,13 @@ def _musicgen_resource_panel() -> None:
 
         if state == "ready":
             st.success(message or f"{_musicgen_label(selected_model)} ready for prompts.")
-        elif state == "pending":
-            st.info(message or f"Preparing {_musicgen_label(selected_model)}...")
+        elif state in {"pending", "loading"}:
+            pending_message = message or f"Preparing {_musicgen_label(selected_model)}..."
+            load = st.session_state.get("musicgen_asset_loads", {}).get(selected_model)
+            if load is not None:
+                _await_background(load, pending_message)
+            else:
+                st.info(pending_message)
         elif state == "error":
             st.error(message or f"{_musicgen_label(selected_model)} unavailable. Retry download.")
         else:
@@ -428,32 +488,50 @@ def _musicgen_resource_panel() -> None:
 
 
 def _ensure_musicgen_assets_if_needed() -> None:
+    """Load pending MusicGen checkpoints on the dedicated download worker.
+
+    The first page render is not held up by the download; the setup panel
+    reports progress on later reruns.
+    """
+
     if not MUSICGEN_AVAILABLE:
         return
 
     assets = _musicgen_assets()
+    loads: dict[str, Future[None]] = st.session_state.setdefault("musicgen_asset_loads", {})
     for model, entry in list(assets.items()):
+        label = _musicgen_label(model)
+        future = loads.get(model)
+        if future is not None:
+            if not future.done():
+                continue
+            del loads[model]
+            # A re-download requested mid-load resets the state to pending; submit it again below.
+            if entry.get("state") == "loading":
+                exc = future.exception()
+                if isinstance(exc, AudiocraftUnavailable):
+                    _update_musicgen_asset(model, state="error", message=str(exc))
+                elif exc is not None:
+                    _update_musicgen_asset(
+                        model,
+                        state="error",
+                        message=f"{label} initialisation failed: {exc}",
+                    )
+                else:
+                    _update_musicgen_asset(model, state="ready", message=f"{label} ready for prompts.")
+                continue
+
         if entry.get("state") != "pending":
             continue
-
-        label = _musicgen_label(model)
-        try:
-            with st.spinner(f"Downloading {label} (first run may take a while)..."):
-                ensure_musicgen_assets(model)
-        except AudiocraftUnavailable as exc:
-            _update_musicgen_asset(model, state="error", message=str(exc))
-        except Exception as exc:  # pragma: no cover - surfacing unexpected setup errors to the UI
-            _update_musicgen_asset(
-                model,
-                state="error",
-                message=f"{label} initialisation failed: {exc}",
-            )
-        else:
-            _update_musicgen_asset(model, state="ready", message=f"{label} ready for prompts.")
+        loads[model] = _download_pool().submit(ensure_musicgen_assets, model)
+        _update_musicgen_asset(
+            model,
+            state="loading",
+            message=f"Downloading {label} in the background (first run may take a while)...",
+        )
 
 
-def _render_css() -> None:
-    custom_css = """
+_APP_CSS = """
     <style>
     [data-testid="stAppViewContainer"] {
         background: radial-gradient(circle at 20% 20%, #1f2937 0%, #030712 55%, #02040a 100%);
@@ -752,12 +830,33 @@ def _render_css() -> None:
     }
     </style>
     """
-    st.markdown(custom_css, unsafe_allow_html=True)
+_CARD_OPEN = "<div class='lofi-card'>"
+_DIV_CLOSE = "</div>"
+_FOOTER_HTML = """
+    <div style=\"margin-top: 2.5rem; text-align: center; color: #94a3b8;\">
+        Open source ❤️ • Share your creations with #LofiSymphony
+    </div>
+    """
+
+
+def _minify_css(markup: str) -> str:
+    """Collapse whitespace in a ``<style>`` block so every rerun ships fewer bytes."""
+
+    return re.sub(r"\s*([{};,])\s*", r"\1", re.sub(r"\s+", " ", markup)).strip()
+
+
+_APP_STYLE = _minify_css(_APP_CSS)
+
+
+def _render_css() -> None:
+    # Style-only st.html goes to the event container, so it takes no layout space
+    # and skips markdown parsing.
+    st.html(_APP_STYLE)
 
 
 def _workflow_guide() -> None:
     st.markdown(
-        """
+        f"""
         <div class="workflow-panel">
             <div style="display: flex; align-items: center; justify-content: space-between; gap: 0.75rem; flex-wrap: wrap;">
                 <div style="display: flex; align-items: center; gap: 0.65rem;">
@@ -770,24 +869,10 @@ def _workflow_guide() -> None:
                 <span class="arranger-chip">Design parity roadmap</span>
             </div>
         </div>
+        {_WORKFLOW_STEPS_HTML}
         """,
         unsafe_allow_html=True,
     )
-    for step in WORKFLOW_GUIDE_STEPS:
-        st.markdown(
-            f"""
-            <div class="workflow-step">
-                <h4>{step["title"]}</h4>
-                <span>{step["highlight"]}</span>
-                <p>{step["details"]}</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-
-
-def _clamp(value: float, low: float, high: float) -> float:
-    return max(low, min(high, value))
 
 
 def _arranger_section_names(sections: Sequence[dict[str, Any]] | None) -> list[str]:
@@ -821,8 +906,7 @@ def _initialise_arranger_state(
 
     timeline: Timeline = st.session_state.get("timeline", Timeline())
     existing_instruments = {track["instrument"] for track in st.session_state.arranger_tracks}
-    discovered_instruments = sorted({event.instrument for event in getattr(timeline, "events", [])})
-    for instrument in discovered_instruments:
+    for instrument in timeline.instruments():
         if instrument not in existing_instruments:
             st.session_state.arranger_tracks.append(
                 {
@@ -843,7 +927,30 @@ def _initialise_arranger_state(
     _sync_arranger_from_sections(sections)
 
     if reset_lanes or "arranger_lanes" not in st.session_state:
+        source = _lane_source_key(sections)
+        if "arranger_lanes" in st.session_state and st.session_state.get("arranger_lanes_source") == source:
+            # Lanes were built from this exact layout and have not been edited since.
+            return
         st.session_state.arranger_lanes = _build_arranger_lane_records(sections)
+        st.session_state.arranger_lanes_source = source
+
+
+def _lane_source_key(sections: Sequence[dict[str, Any]] | None) -> tuple[Any, ...]:
+    """Summarise the section and track layout that :func:`_build_arranger_lane_records` reads."""
+
+    tracks = st.session_state.get("arranger_tracks", [])
+    return (
+        tuple(
+            (
+                section.get("name"),
+                section.get("start_bar", 0),
+                section.get("n_bars", 4),
+                tuple(section.get("instruments") or ()),
+            )
+            for section in sections or ()
+        ),
+        tuple(track["instrument"] for track in tracks),
+    )
 
 
 def _sync_arranger_from_sections(sections: Sequence[dict[str, Any]] | None) -> None:
@@ -900,6 +1007,26 @@ def _build_arranger_lane_records(sections: Sequence[dict[str, Any]] | None) -> l
     return lanes
 
 
+LANE_COLUMNS = ("Order", "Section", "Instrument", "Start (beats)", "Length (beats)")
+LaneKey = tuple[tuple[Any, ...], ...]
+
+
+def _lane_key(lanes: Sequence[dict[str, Any]]) -> LaneKey:
+    """Flatten lane records into a hashable key for caching and change detection."""
+
+    return tuple(tuple(record.get(column) for column in LANE_COLUMNS) for record in lanes)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _build_lane_frame(rows: LaneKey) -> Any:
+    """Build the clip lane editor frame from lane rows with a trailing effects column."""
+
+    import pandas as pd
+
+    frame = pd.DataFrame(list(rows), columns=[*LANE_COLUMNS, "Effects"])
+    return frame.sort_values("Order").reset_index(drop=True)
+
+
 def _section_for_start(start: float, sections: Sequence[dict[str, Any]] | None) -> str | None:
     if not sections:
         return None
@@ -960,21 +1087,27 @@ def _update_sections_from_lanes(lanes: list[dict[str, Any]]) -> None:
 
     previous_map = {section["name"]: dict(section) for section in previous_sections if section.get("name")}
 
-    section_accumulator: dict[str, dict[str, float]] = defaultdict(lambda: {"start": None, "end": None})
+    # Section name -> mutable [start, end] span in beats.
+    section_accumulator: dict[str, list[float]] = {}
     for lane in lanes:
         section_name = lane.get("Section")
         start = float(lane.get("Start (beats)", 0.0))
         length = float(lane.get("Length (beats)", BEATS_PER_BAR * 4))
         end = start + length
-        stats = section_accumulator[section_name]
-        stats["start"] = start if stats["start"] is None else min(stats["start"], start)
-        stats["end"] = end if stats["end"] is None else max(stats["end"], end)
+        stats = section_accumulator.get(section_name)
+        if stats is None:
+            section_accumulator[section_name] = [start, end]
+            continue
+        if start < stats[0]:
+            stats[0] = start
+        if end > stats[1]:
+            stats[1] = end
 
     delta_map: dict[str, float] = {}
     updated_sections: list[dict[str, Any]] = []
-    for section_name, stats in section_accumulator.items():
-        start_beats = stats["start"] or 0.0
-        end_beats = stats["end"] or (start_beats + BEATS_PER_BAR * 4)
+    for section_name, (start_beats, end_beats) in section_accumulator.items():
+        start_beats = start_beats or 0.0
+        end_beats = end_beats or (start_beats + BEATS_PER_BAR * 4)
         length_beats = max(BEATS_PER_BAR, end_beats - start_beats)
         start_bar = int(round(start_beats / BEATS_PER_BAR))
         n_bars = max(1, int(round(length_beats / BEATS_PER_BAR)))
@@ -1012,37 +1145,67 @@ def _shift_timeline_sections(previous_sections: Sequence[dict[str, Any]], delta_
     if not timeline.events:
         return
 
-    section_ranges = []
-    for section in previous_sections:
-        name = section.get("name")
-        start = section.get("start_bar", 0) * BEATS_PER_BAR
-        end = start + section.get("n_bars", 4) * BEATS_PER_BAR
-        section_ranges.append((name, start, end))
-
-    adjusted_events: list[TimelineEvent] = []
-    for event in timeline.events:
-        section_name = None
-        for name, start, end in section_ranges:
-            if start <= event.start < end:
-                section_name = name
-                break
-        delta = delta_map.get(section_name, 0.0)
-        adjusted_events.append(
-            dataclass_replace(
-                event,
-                start=max(0.0, event.start + delta),
-            )
-        )
+    section_starts = np.array(
+        [section.get("start_bar", 0) * BEATS_PER_BAR for section in previous_sections], dtype=np.float64
+    )
+    section_ends = section_starts + np.array(
+        [section.get("n_bars", 4) * BEATS_PER_BAR for section in previous_sections], dtype=np.float64
+    )
+    section_deltas = np.array(
+        [delta_map.get(section.get("name"), 0.0) for section in previous_sections], dtype=np.float64
+    )
 
+    events = timeline.events
+    event_starts = np.fromiter((event.start for event in events), dtype=np.float64, count=len(events))
+    # Lane edits can leave sections overlapping or out of order, so test every
+    # section against every event and take the first one in list order that
+    # contains it; a song has only a handful of sections.
+    inside = (section_starts[:, None] <= event_starts) & (event_starts < section_ends[:, None])
+    first_match = inside.argmax(axis=0)
+    deltas = np.where(inside.any(axis=0), section_deltas[first_match], 0.0)
+    shifted_starts = np.maximum(0.0, event_starts + deltas)
+
+    adjusted_events = [
+        dataclass_replace(event, start=start) for event, start in zip(events, shifted_starts.tolist())
+    ]
     st.session_state.timeline = Timeline(adjusted_events)
 
 
 def _arranger_filtered_timeline(timeline: Timeline) -> Timeline:
+    """Apply the mixer's mute/solo, volume and section automation to ``timeline``.
+
+    Live mixer widgets rerun the script on every move, so the result is kept
+    in session state and reused while the timeline, the sections and the mix
+    are unchanged.
+    """
+
+    if not len(timeline):
+        return timeline
+
+    sections = st.session_state.get("arrangement_sections")
+    tracks = st.session_state.get("arranger_tracks", [])
+    mix_key = (
+        timeline.signature(),
+        _arranger_mix_signature(),
+        tuple(
+            (track.get("enabled", True), track.get("solo", False), tuple(track.get("automation", {}).items()))
+            for track in tracks
+        ),
+    )
+    cached = st.session_state.get("arranger_playback")
+    if cached is not None and cached[0] is sections and cached[1] == mix_key:
+        return cached[2]
+
+    playback = _filter_timeline_for_playback(timeline, sections or [])
+    st.session_state.arranger_playback = (sections, mix_key, playback)
+    return playback
+
+
+def _filter_timeline_for_playback(timeline: Timeline, sections: Sequence[dict[str, Any]]) -> Timeline:
     active_tracks = _active_arranger_tracks()
     if not active_tracks:
         return Timeline([])
 
-    sections = st.session_state.get("arrangement_sections") or []
     filtered_events: list[TimelineEvent] = []
 
     for event in timeline.events:
@@ -1060,7 +1223,8 @@ def _arranger_filtered_timeline(timeline: Timeline) -> Timeline:
         automation_factor = automation_value / 100.0
 
         velocity = int(round(event.velocity * volume_factor * automation_factor))
-        velocity = int(_clamp(velocity, 1, 127))
+        # Inlined clamp: this runs once per event on every playback render.
+        velocity = 1 if velocity < 1 else 127 if velocity > 127 else velocity
 
         filtered_events.append(
             dataclass_replace(
@@ -1072,12 +1236,10 @@ def _arranger_filtered_timeline(timeline: Timeline) -> Timeline:
     return Timeline(filtered_events)
 
 
-def _apply_arranger_midi_mix(midi_obj: pretty_midi.PrettyMIDI) -> None:
-    if not midi_obj.instruments:
-        return
+def _apply_arranger_midi_mix(midi_obj: pretty_midi.PrettyMIDI, track_map: dict[str, dict[str, Any]]) -> None:
+    import pretty_midi
 
-    track_map = _arranger_tracks_map()
-    if not track_map:
+    if not midi_obj.instruments or not track_map:
         return
 
     for instrument in midi_obj.instruments:
@@ -1102,6 +1264,215 @@ def _apply_arranger_midi_mix(midi_obj: pretty_midi.PrettyMIDI) -> None:
             instrument.name = f"{track['instrument']} ({', '.join(effects)})"
         else:
             instrument.name = track["instrument"]
+
+
+MixSignature = tuple[tuple[str, int, int, tuple[str, ...]], ...]
+
+
+def _arranger_mix_signature() -> MixSignature:
+    """Flatten the arranger settings that shape timeline renders into a hashable key."""
+
+    tracks = st.session_state.get("arranger_tracks", [])
+    return tuple(
+        (
+            track["instrument"],
+            int(track.get("volume", 100)),
+            int(track.get("pan", 0)),
+            tuple(track.get("effects") or ()),
+        )
+        for track in tracks
+    )
+
+
+def _render_timeline_artifacts(
+    timeline: Timeline,
+    tempo: int,
+    mix_signature: MixSignature,
+    vinyl_fx: bool,
+) -> tuple[bytes, bytes]:
+    """Render an arranged timeline to ``(midi_bytes, wav_bytes)``.
+
+    Runs on the render pool, outside any script run, so it is deliberately
+    uncached; :func:`_timeline_renders` keeps the finished results.
+    """
+
+    track_map: dict[str, dict[str, Any]] = {}
+    effects_map: dict[str, list[str]] = {}
+    for instrument, volume, pan, effects in mix_signature:
+        track_map[instrument] = {"instrument": instrument, "volume": volume, "pan": pan, "effects": list(effects)}
+        if effects:
+            effects_map[instrument] = list(effects)
+
+    midi_obj = timeline.to_pretty_midi(tempo)
+    _apply_arranger_midi_mix(midi_obj, track_map)
+    midi_buffer = io.BytesIO()
+    midi_obj.write(midi_buffer)
+    midi_payload = midi_buffer.getvalue()
+    return midi_payload, _synthesise_wav(midi_payload, vinyl_fx, effects_map)
+
+
+def _synthesise_wav(midi_payload: bytes, vinyl_fx: bool, instrument_effects: Mapping[str, list[str]]) -> bytes:
+    """Synthesise ``midi_payload`` and encode it as WAV; the cached renderers share this step."""
+
+    audio_segment = midi_to_audio(
+        midi_payload,
+        add_vinyl_fx=vinyl_fx,
+        instrument_effects=instrument_effects,
+    )
+    return audio_to_wav_bytes(audio_segment)
+
+
+@st.cache_data(ttl=24 * 60 * 60, max_entries=8, show_spinner=False)
+def _render_midi_to_wav(
+    midi_payload: bytes,
+    vinyl_fx: bool,
+    instrument_effects: dict[str, list[str]],
+) -> bytes:
+    """Render a generated MIDI payload to WAV bytes, memoised on the payload and FX settings.
+
+    The bytes live in the cache and the session rather than in a temporary
+    file, so evicted or superseded renders leave nothing behind on disk.
+    """
+
+    return _synthesise_wav(midi_payload, vinyl_fx, instrument_effects)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _read_file_bytes(path: str, mtime_ns: int) -> bytes:
+    """Read a rendered file once per modification time; ``mtime_ns`` only keys the cache."""
+
+    return Path(path).read_bytes()
+
+
+def _rendered_file_bytes(path: Path) -> bytes:
+    return _read_file_bytes(str(path), path.stat().st_mtime_ns)
+
+
+@st.cache_resource(show_spinner=False)
+def _render_pool() -> ThreadPoolExecutor:
+    """Return the process-wide background pool.
+
+    Streamlit re-executes this module on every rerun, so a module-level
+    executor would be rebuilt each time and stop bounding concurrent renders.
+    """
+
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="lofi-render")
+
+
+@st.cache_resource(show_spinner=False)
+def _download_pool() -> ThreadPoolExecutor:
+    """Return the single worker that fetches MusicGen checkpoints.
+
+    Downloads can run for minutes, so they queue here instead of occupying
+    render-pool workers that timeline renders and previews are waiting on.
+    """
+
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="lofi-download")
+
+
+class _BackgroundJobs:
+    """Process-wide futures for background jobs, keyed on the job's inputs.
+
+    Workers have no script run context, so they call plain helpers rather than
+    ``st.cache_*`` functions; the finished futures kept here are the cache.
+    Failed jobs, and results rejected by ``validate``, are resubmitted, and
+    the oldest entries are dropped beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._futures: OrderedDict[Hashable, Future[Any]] = OrderedDict()
+
+    def submit(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        /,
+        *args: Any,
+        validate: Callable[[Any], bool] | None = None,
+        **kwargs: Any,
+    ) -> Future[Any]:
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and not self._stale(future, validate):
+                self._futures.move_to_end(key)
+                return future
+            future = _render_pool().submit(fn, *args, **kwargs)
+            self._futures[key] = future
+            while len(self._futures) > self._max_entries:
+                self._futures.popitem(last=False)
+            return future
+
+    @staticmethod
+    def _stale(future: Future[Any], validate: Callable[[Any], bool] | None) -> bool:
+        if not future.done():
+            return False
+        if future.exception() is not None:
+            return True
+        return validate is not None and not validate(future.result())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._futures.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def _timeline_renders() -> _BackgroundJobs:
+    """Timeline renders shared by every session, keyed on :data:`RenderKey`."""
+
+    return _BackgroundJobs(max_entries=8)
+
+
+@st.cache_resource(show_spinner=False)
+def _musicgen_jobs() -> _BackgroundJobs:
+    """MusicGen previews and blends shared by every session, keyed on their prompts and settings."""
+
+    return _BackgroundJobs(max_entries=16)
+
+
+_RENDER_GRACE_SECONDS = 0.5
+_BACKGROUND_POLL_SECONDS = 1.0
+RenderKey = tuple[int, int, MixSignature, bool]
+
+
+def _timeline_render_future(render_key: RenderKey, timeline: Timeline) -> Future[tuple[bytes, bytes]]:
+    """Return the background render for ``render_key``, submitting a new one when inputs change.
+
+    ``render_key`` starts with the timeline's :meth:`Timeline.signature`, which
+    stands in for the timeline itself.
+    """
+
+    _, tempo, mix_signature, vinyl_fx = render_key
+    return _timeline_renders().submit(render_key, _render_timeline_artifacts, timeline, tempo, mix_signature, vinyl_fx)
+
+
+@st.fragment(run_every=_BACKGROUND_POLL_SECONDS)
+def _await_background(future: Future[Any], pending_message: str) -> None:
+    """Show ``pending_message`` until ``future`` settles, then rerun the app to pick up its result."""
+
+    if future.done():
+        st.rerun()
+    st.info(pending_message)
+
+
+def _collect_background_result(state_key: str, pending_message: str) -> Any | None:
+    """Pop the finished future stored under ``state_key`` and return its result.
+
+    While the future is still running a self-refreshing notice is shown and
+    ``None`` is returned; exceptions raised by the worker propagate to the caller.
+    """
+
+    future: Future[Any] | None = st.session_state.get(state_key)
+    if future is None:
+        return None
+    if not future.done():
+        _await_background(future, pending_message)
+        return None
+    st.session_state[state_key] = None
+    return future.result()
+
+
 def _render_header() -> None:
     st.markdown(
         """
@@ -1122,9 +1493,9 @@ def _render_header() -> None:
 
 def _render_session_overview(settings: SessionSettings) -> None:
     timeline: Timeline = st.session_state.timeline
-    total_events = len(timeline.events)
-    timeline_instruments = sorted({event.instrument for event in timeline.events})
-    max_end = max((event.start + event.duration) for event in timeline.events) if timeline.events else 0.0
+    total_events = len(timeline)
+    timeline_instruments = timeline.instruments()
+    max_end = timeline.max_end
 
     st.markdown(
         f"""
@@ -1155,18 +1526,50 @@ def _render_session_overview(settings: SessionSettings) -> None:
     )
 
 
+_PROGRESSION_CHIP_OPEN = "<span class='progression-chip'>"
+_INSTRUMENT_TAG_OPEN = "<span class='instrument-tag'>🎚️ "
+_ARRANGER_CHIP_OPEN = "<span class='arranger-chip'>"
+_CHIP_CLOSE = "</span>"
+
+
+def _chips_html(opening: str, labels: Sequence[Any]) -> str:
+    """Render ``labels`` as adjacent chip spans with a single separator join."""
+
+    if not labels:
+        return ""
+    return opening + (_CHIP_CLOSE + opening).join(map(str, labels)) + _CHIP_CLOSE
+
+
+def _memoised_html(memo_key: str, source: Any, build: Callable[[Any], str]) -> str:
+    """Return ``build(source)``, reusing the previous markup while ``source`` is the same object.
+
+    Generator metadata and arrangement sections are replaced rather than
+    mutated, so object identity is enough to detect a change.
+    """
+
+    cached = st.session_state.get(memo_key)
+    if cached is not None and cached[0] is source:
+        return cached[1]
+    markup = build(source)
+    st.session_state[memo_key] = (source, markup)
+    return markup
+
+
 def _render_progression_summary(metadata: dict[str, Any]) -> None:
+    st.markdown(_memoised_html("progression_summary_html", metadata, _progression_summary_html), unsafe_allow_html=True)
+
+
+def _progression_summary_html(metadata: dict[str, Any]) -> str:
     chords: Sequence[str] = metadata.get("progression", [])
-    chord_html = "".join(f"<span class='progression-chip'>{roman}</span>" for roman in chords)
+    chord_html = _chips_html(_PROGRESSION_CHIP_OPEN, chords)
     palette = metadata.get("palette", "")
     mood = metadata.get("mood", "")
     tempo = metadata.get("tempo", 0)
     tonality = f"{metadata.get('key', '')} {str(metadata.get('scale', '')).title()}".strip()
     instrument_tags = metadata.get("instruments", [])
-    tags_html = "".join(f"<span class='instrument-tag'>🎚️ {name}</span>" for name in instrument_tags)
+    tags_html = _chips_html(_INSTRUMENT_TAG_OPEN, instrument_tags)
 
-    st.markdown(
-        f"""
+    return f"""
         <div class="progression-card">
             <div class="progression-header">
                 <span class="progression-title">Latest progression</span>
@@ -1178,72 +1581,62 @@ def _render_progression_summary(metadata: dict[str, Any]) -> None:
                 {tags_html}
             </div>
         </div>
-        """,
-        unsafe_allow_html=True,
+        """
+
+
+_ARRANGEMENT_TABLE_HEAD = """
+<table class='arrangement-table'>
+    <thead>
+        <tr>
+            <th>Section</th>
+            <th>Range</th>
+            <th>Progression</th>
+            <th>Instruments</th>
+            <th>Highlights</th>
+        </tr>
+    </thead>
+    <tbody>"""
+_ARRANGEMENT_TABLE_TAIL = """</tbody>
+</table>
+"""
+_HOOK_BADGE_HTML = "<span class='arrangement-badge'>🎣 Hook</span>"
+
+
+def _arrangement_row_html(section: dict[str, Any]) -> str:
+    start_bar = int(section.get("start_bar", 0)) + 1
+    end_bar = start_bar + max(int(section.get("n_bars", 0)), 1) - 1
+    name = html.escape(str(section.get("name", "Section")))
+    chords = html.escape(" – ".join(section.get("progression", [])))
+    instruments = html.escape(", ".join(section.get("instruments", []))) or "—"
+    badge = _HOOK_BADGE_HTML if section.get("has_hook") else "—"
+    return (
+        f"<tr><td>{name}</td><td>Bars {start_bar}-{end_bar}</td>"
+        f"<td>{chords}</td><td>{instruments}</td><td>{badge}</td></tr>"
     )
 
 
 def _render_arrangement_overview(sections: Sequence[dict[str, Any]]) -> None:
     if not sections:
         return
+    st.markdown(_memoised_html("arrangement_overview_html", sections, _arrangement_overview_html), unsafe_allow_html=True)
 
-    rows: list[str] = []
-    for section in sections:
-        start_bar = int(section.get("start_bar", 0)) + 1
-        length = int(section.get("n_bars", 0))
-        end_bar = start_bar + max(length, 1) - 1
-        chord_html = " – ".join(section.get("progression", []))
-        instruments = ", ".join(section.get("instruments", []))
-        hook_badge = (
-            "<span class='arrangement-badge'>🎣 Hook</span>" if section.get("has_hook") else "—"
-        )
-        rows.append(
-            """
-            <tr>
-                <td>{name}</td>
-                <td>Bars {start}-{end}</td>
-                <td>{chords}</td>
-                <td>{instruments}</td>
-                <td>{badge}</td>
-            </tr>
-            """.format(
-                name=section.get("name", "Section"),
-                start=start_bar,
-                end=end_bar,
-                chords=chord_html,
-                instruments=instruments or "—",
-                badge=hook_badge,
-            )
-        )
 
-    table_html = """
-        <table class='arrangement-table'>
-            <thead>
-                <tr>
-                    <th>Section</th>
-                    <th>Range</th>
-                    <th>Progression</th>
-                    <th>Instruments</th>
-                    <th>Highlights</th>
-                </tr>
-            </thead>
-            <tbody>{rows}</tbody>
-        </table>
-    """.format(rows="".join(rows))
+def _arrangement_overview_html(sections: Sequence[dict[str, Any]]) -> str:
+    rows_html = "".join([_arrangement_row_html(section) for section in sections])
+    table_html = f"{_ARRANGEMENT_TABLE_HEAD}{rows_html}{_ARRANGEMENT_TABLE_TAIL}"
 
     hook_motif = next(
         (section.get("hook_motif", []) for section in sections if section.get("has_hook") and section.get("hook_motif")),
         [],
     )
-    motif_html = "".join(f"<span class='progression-chip'>{note}</span>" for note in hook_motif)
+    motif_html = _chips_html(_PROGRESSION_CHIP_OPEN, hook_motif)
     motif_block = (
         f"<div class='arrangement-motif'>Hook motif • <div class='progression-chips'>{motif_html}</div></div>"
         if motif_html
         else ""
     )
 
-    st.markdown(
-        f"""
+    return f"""
         <div class='progression-card'>
             <div class='progression-header'>
                 <span class='progression-title'>Song arrangement</span>
@@ -1252,51 +1645,64 @@ def _render_arrangement_overview(sections: Sequence[dict[str, Any]]) -> None:
             {table_html}
             {motif_block}
         </div>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+
+MIDI_NOTE_COUNT = 128
+_NO_NOTE_STARTS = array.array("d", [math.nan] * MIDI_NOTE_COUNT)
+
+
+def _empty_note_starts() -> array.array:
+    """Return a per-note start-time table where ``nan`` marks a released note."""
+
+    return array.array("d", _NO_NOTE_STARTS)
+
+
+# Session defaults; callables are invoked so each session gets its own instance.
+_SESSION_DEFAULTS: dict[str, Any] = {
+    "timeline": Timeline,
+    "recording": False,
+    "record_instrument": "Piano",
+    "last_pressed_note": None,
+    "keyboard_velocity": 95,
+    "keyboard_cursor": 0.0,
+    "midi_note_starts": _empty_note_starts,
+    "record_start": 0.0,
+    "generated_midi": None,
+    "generated_audio": None,
+    "generator_metadata": None,
+    "musicgen_path": None,
+    "musicgen_future": None,
+    "musicgen_blend_future": None,
+    "musicgen_blend_audio": None,
+    "arrangement_sections": None,
+    "soundfont_auto_activate": True,
+    "musicgen_model": DEFAULT_MUSICGEN_MODEL,
+}
 
 
 def _initialise_state() -> None:
-    if "timeline" not in st.session_state:
-        st.session_state.timeline = Timeline()
-    if "recording" not in st.session_state:
-        st.session_state.recording = False
-    if "record_instrument" not in st.session_state:
-        st.session_state.record_instrument = "Piano"
-    if "last_pressed_note" not in st.session_state:
-        st.session_state.last_pressed_note = None
-    if "keyboard_velocity" not in st.session_state:
-        st.session_state.keyboard_velocity = 95
-    if "keyboard_cursor" not in st.session_state:
-        st.session_state.keyboard_cursor = 0.0
-    if "midi_manager" not in st.session_state:
+    state = st.session_state
+    for key, default in _SESSION_DEFAULTS.items():
+        if key not in state:
+            state[key] = default() if callable(default) else default
+    if "midi_manager" not in state:
         try:
-            st.session_state.midi_manager = MidiInputManager()
-            st.session_state.midi_status = "Disconnected"
+            state.midi_manager = MidiInputManager()
+            state.midi_status = "Disconnected"
         except MidiBackendUnavailable:
-            st.session_state.midi_manager = None
-            st.session_state.midi_status = "Backend unavailable"
-    if "midi_note_starts" not in st.session_state:
-        st.session_state.midi_note_starts = {}
-    if "record_start" not in st.session_state:
-        st.session_state.record_start = 0.0
-    if "generated_midi" not in st.session_state:
-        st.session_state.generated_midi = None
-    if "generated_audio" not in st.session_state:
-        st.session_state.generated_audio = None
-    if "generator_metadata" not in st.session_state:
-        st.session_state.generator_metadata = None
-    if "musicgen_path" not in st.session_state:
-        st.session_state.musicgen_path = None
-    if "arrangement_sections" not in st.session_state:
-        st.session_state.arrangement_sections = None
-    if "soundfont_auto_activate" not in st.session_state:
-        st.session_state.soundfont_auto_activate = True
-    if "musicgen_model" not in st.session_state:
-        st.session_state.musicgen_model = DEFAULT_MUSICGEN_MODEL
+            state.midi_manager = None
+            state.midi_status = "Backend unavailable"
     _musicgen_assets()
-    _initialise_arranger_state(st.session_state.arrangement_sections)
+    _initialise_arranger_state(state.arrangement_sections)
+
+
+_SIDEBAR_TIP_HTML = """
+<small style="color: #94a3b8;">
+💡 Tip: The timeline editor mirrors your DAW. Quantize clips, blend MusicGen stems, or export to
+MIDI and WAV without leaving the browser.
+</small>
+"""
 
 
 def _settings_panel() -> SessionSettings:
@@ -1326,15 +1732,7 @@ def _settings_panel() -> SessionSettings:
             "or when testing raw stems."
         ),
     )
-    st.sidebar.markdown(
-        """
-        <small style="color: #94a3b8;">
-        💡 Tip: The timeline editor mirrors your DAW. Quantize clips, blend MusicGen stems, or export to
-        MIDI and WAV without leaving the browser.
-        </small>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.sidebar.markdown(_SIDEBAR_TIP_HTML, unsafe_allow_html=True)
 
     _soundfont_library_panel()
     _musicgen_resource_panel()
@@ -1346,12 +1744,18 @@ def _settings_panel() -> SessionSettings:
         mood=selected_mood,
         tempo=selected_tempo,
         rhythm=selected_rhythm,
-        instruments=selected_instruments,
+        instruments=tuple(selected_instruments),
         vinyl_fx=vinyl_fx_enabled,
     )
 
 
 def _note_to_midi(note_name: str) -> int:
+    pitch = _KEYBOARD_PITCHES.get(note_name)
+    if pitch is not None:
+        return pitch
+
+    import pretty_midi
+
     return pretty_midi.note_name_to_number(note_name)
 
 
@@ -1384,6 +1788,8 @@ def _note_preview_audio(note_name: str, instrument: str) -> bytes | None:
     if program is None:
         return None
 
+    import pretty_midi
+
     midi_obj = pretty_midi.PrettyMIDI()
     preview_instrument = pretty_midi.Instrument(program=program, name=f"{instrument} Preview")
     pitch = _note_to_midi(note_name)
@@ -1397,7 +1803,7 @@ def _note_preview_audio(note_name: str, instrument: str) -> bytes | None:
     midi_payload = midi_buffer.getvalue()
 
     try:
-        audio_segment = midi_to_audio(io.BytesIO(midi_payload), add_vinyl_fx=False)
+        audio_segment = midi_to_audio(midi_payload, add_vinyl_fx=False)
     except RuntimeWarning:
         return None
     except Exception:
@@ -1410,45 +1816,93 @@ def _note_preview_audio(note_name: str, instrument: str) -> bytes | None:
         except Exception:
             pass
 
-    buffer = io.BytesIO()
-    preview_segment.export(buffer, format="wav")
-    return buffer.getvalue()
+    return audio_to_wav_bytes(preview_segment)
 
 
 def _update_timeline_cursor() -> None:
     """Nudge the timeline cursor to the end of the current arrangement."""
 
     timeline: Timeline = st.session_state.timeline
-    if not timeline.events:
-        st.session_state.keyboard_cursor = 0.0
-        return
+    st.session_state.keyboard_cursor = timeline.max_end
 
-    max_end = max(event.start + event.duration for event in timeline.events)
-    st.session_state.keyboard_cursor = max_end
 
+@lru_cache(maxsize=1)
+def _symusic_module() -> Any | None:
+    """Return the optional ``symusic`` MIDI parser when it is installed."""
+
+    if importlib.util.find_spec("symusic") is None:
+        return None
+    return importlib.import_module("symusic")
+
+
+def _iter_midi_note_arrays(
+    midi_payload: bytes,
+) -> Iterator[tuple[str, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield ``(instrument, starts, durations, pitches, velocities)`` per MIDI track."""
+
+    import pretty_midi
+
+    symusic = _symusic_module()
+    if symusic is not None:
+        # symusic parses in C++; convert to seconds to match pretty_midi timing.
+        score = symusic.Score.from_midi(midi_payload).to("second")
+        for track in score.tracks:
+            instrument_name = "Drums" if track.is_drum else pretty_midi.program_to_instrument_name(track.program)
+            notes = track.notes.numpy()
+            yield instrument_name, notes["time"], notes["duration"], notes["pitch"], notes["velocity"]
+        return
 
-def _ingest_midi_into_timeline(midi_payload: bytes) -> None:
     midi = pretty_midi.PrettyMIDI(io.BytesIO(midi_payload))
-    events: list[TimelineEvent] = []
     for instrument in midi.instruments:
         instrument_name = "Drums" if instrument.is_drum else pretty_midi.program_to_instrument_name(instrument.program)
-        for note in instrument.notes:
-            events.append(
-                TimelineEvent(
-                    start=float(note.start),
-                    duration=float(note.end - note.start),
-                    pitch=int(note.pitch),
-                    velocity=int(note.velocity),
-                    instrument=instrument_name,
-                )
-            )
+        notes = instrument.notes
+        count = len(notes)
+        starts = np.fromiter((note.start for note in notes), dtype=np.float64, count=count)
+        ends = np.fromiter((note.end for note in notes), dtype=np.float64, count=count)
+        pitches = np.fromiter((note.pitch for note in notes), dtype=np.int64, count=count)
+        velocities = np.fromiter((note.velocity for note in notes), dtype=np.int64, count=count)
+        yield instrument_name, starts, ends - starts, pitches, velocities
+
+
+def _ingest_midi_into_timeline(midi_payload: bytes, *, grid: float | None = None) -> None:
+    """Append the notes in ``midi_payload`` to the session timeline.
+
+    When ``grid`` is given the new notes are snapped with the same rounding as
+    :meth:`Timeline.quantize`, without a second pass over the timeline.
+    """
+
+    tracks = list(_iter_midi_note_arrays(midi_payload))
+    if not tracks:
+        return
+
+    names = np.array([track[0] for track in tracks], dtype=object)
+    instruments = np.repeat(names, [len(track[1]) for track in tracks])
+    starts = np.concatenate([track[1] for track in tracks]).astype(np.float64, copy=False)
+    durations = np.concatenate([track[2] for track in tracks]).astype(np.float64, copy=False)
+    pitches = np.concatenate([track[3] for track in tracks]).astype(np.int64, copy=False)
+    velocities = np.concatenate([track[4] for track in tracks]).astype(np.int64, copy=False)
+    if grid is not None:
+        starts = np.round(starts / grid) * grid
+        durations = np.maximum(grid, np.round(durations / grid) * grid)
+
+    # Positional map() over the column lists skips per-note tuple unpacking and keyword binding.
+    events = list(
+        map(
+            TimelineEvent,
+            starts.tolist(),
+            durations.tolist(),
+            pitches.tolist(),
+            velocities.tolist(),
+            instruments.tolist(),
+        )
+    )
     if events:
         st.session_state.timeline.extend(events)
         _update_timeline_cursor()
 
 
 def _register_keyboard_note(note_name: str, tempo: int) -> None:
-    pitch = _note_to_midi(note_name)
+    pitch = _KEYBOARD_PITCHES[note_name]
     instrument = st.session_state.record_instrument
     velocity = int(st.session_state.get("keyboard_velocity", 95))
     velocity = max(1, min(127, velocity))
@@ -1473,17 +1927,19 @@ def _register_keyboard_note(note_name: str, tempo: int) -> None:
 
 
 def _handle_midi_message(message: MidiMessage, tempo: int) -> None:
+    starts = st.session_state.midi_note_starts
     if not st.session_state.recording:
         if message.velocity <= 0:
-            st.session_state.midi_note_starts.pop(message.note, None)
+            starts[message.note] = math.nan
         return
 
     if message.velocity > 0:
-        st.session_state.midi_note_starts[message.note] = message.timestamp
+        starts[message.note] = message.timestamp
         return
 
-    start_time = st.session_state.midi_note_starts.pop(message.note, None)
-    if start_time is None:
+    start_time = starts[message.note]
+    starts[message.note] = math.nan
+    if math.isnan(start_time):
         return
 
     elapsed = start_time - st.session_state.record_start
@@ -1501,11 +1957,7 @@ def _handle_midi_message(message: MidiMessage, tempo: int) -> None:
     _update_timeline_cursor()
 
 
-def _keyboard_block(settings: SessionSettings) -> None:
-    st.markdown("### Virtual keyboard")
-    st.caption("Click keys to play notes, build ideas, and capture takes.")
-
-    keyboard_css = """
+_KEYBOARD_CSS = """
     <style>
     .keyboard-pane {
         position: relative;
@@ -1576,60 +2028,6 @@ def _keyboard_block(settings: SessionSettings) -> None:
         font-weight: 600;
         letter-spacing: 0.1em;
     }
-    .keyboard-keys-row {
-        margin-top: 1.5rem;
-        padding: 1.2rem 1.5rem 1.65rem;
-        border-radius: 22px;
-        background: rgba(15, 23, 42, 0.72);
-        border: 1px solid rgba(100, 116, 139, 0.22);
-        box-shadow: inset 0 1px 0 rgba(226, 232, 240, 0.08);
-    }
-    .keyboard-keys-row [data-testid="column"] {
-        padding-left: 0.75rem;
-        padding-right: 0.75rem;
-    }
-    .keyboard-octave {
-        display: flex;
-        flex-direction: column;
-        gap: 0.9rem;
-    }
-    .keyboard-octave-label {
-        display: inline-flex;
-        align-items: center;
-        padding: 0.28rem 0.85rem;
-        border-radius: 999px;
-        text-transform: uppercase;
-        letter-spacing: 0.12em;
-        font-size: 0.72rem;
-        font-weight: 600;
-        background: rgba(129, 140, 248, 0.18);
-        border: 1px solid rgba(129, 140, 248, 0.42);
-        color: rgba(224, 231, 255, 0.9);
-        box-shadow: 0 6px 18px rgba(79, 70, 229, 0.25);
-    }
-    .keyboard-key-stack {
-        position: relative;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        gap: 0.4rem;
-    }
-    @media (max-width: 1100px) {
-        .keyboard-keys-row [data-testid="column"] {
-            padding-left: 0.5rem;
-            padding-right: 0.5rem;
-        }
-    }
-    @media (max-width: 768px) {
-        .keyboard-keys-row [data-testid="column"] {
-            padding-left: 0.35rem;
-            padding-right: 0.35rem;
-        }
-        .keyboard-octave-label {
-            font-size: 0.68rem;
-            letter-spacing: 0.1em;
-        }
-    }
     .keyboard-slider-wrap > div > div {
         background: transparent !important;
         padding: 0 !important;
@@ -1644,11 +2042,194 @@ def _keyboard_block(settings: SessionSettings) -> None:
         padding: 0.35rem 0 0;
     }
     </style>
-    """
-    st.markdown(keyboard_css, unsafe_allow_html=True)
+"""
+
+
+_KEYBOARD_COMPONENT_CSS = """
+.keyboard-keys {
+    display: flex;
+    gap: 1.5rem;
+    padding: 1.2rem 1.5rem 1.65rem;
+    border-radius: 22px;
+    background: rgba(15, 23, 42, 0.72);
+    border: 1px solid rgba(100, 116, 139, 0.22);
+    box-shadow: inset 0 1px 0 rgba(226, 232, 240, 0.08);
+}
+.keyboard-octave {
+    flex: 1;
+    display: flex;
+    flex-direction: column;
+    gap: 0.9rem;
+}
+.keyboard-octave-label {
+    align-self: flex-start;
+    padding: 0.28rem 0.85rem;
+    border-radius: 999px;
+    text-transform: uppercase;
+    letter-spacing: 0.12em;
+    font: 600 0.72rem sans-serif;
+    background: rgba(129, 140, 248, 0.18);
+    border: 1px solid rgba(129, 140, 248, 0.42);
+    color: rgba(224, 231, 255, 0.9);
+    box-shadow: 0 6px 18px rgba(79, 70, 229, 0.25);
+}
+.keyboard-octave-keys {
+    display: flex;
+    gap: 0.4rem;
+}
+.keyboard-slot {
+    position: relative;
+    flex: 1;
+}
+.keyboard-key {
+    display: flex;
+    align-items: flex-end;
+    justify-content: center;
+    font-family: sans-serif;
+    font-weight: 600;
+    cursor: pointer;
+    transition: transform 0.12s ease, box-shadow 0.12s ease, border-color 0.12s ease;
+}
+.keyboard-key--white {
+    width: 100%;
+    height: 170px;
+    padding-bottom: 14px;
+    border-radius: 18px;
+    font-size: 0.95rem;
+    color: #0f172a;
+    background: linear-gradient(180deg, #ffffff 0%, #e2e8f0 100%);
+    border: 1.5px solid rgba(148, 163, 184, 0.35);
+    box-shadow: 0 22px 40px rgba(15, 23, 42, 0.5);
+}
+.keyboard-key--black {
+    position: absolute;
+    top: 0;
+    right: -37%;
+    z-index: 4;
+    width: 74%;
+    height: 120px;
+    padding-bottom: 10px;
+    border-radius: 14px;
+    font-size: 0.85rem;
+    color: #e0f2fe;
+    background: linear-gradient(180deg, #0b1120 0%, #111827 100%);
+    border: 1.5px solid rgba(30, 41, 59, 0.7);
+    box-shadow: 0 28px 44px rgba(15, 23, 42, 0.65);
+}
+.keyboard-key--in-scale {
+    border-color: rgba(56, 189, 248, 0.75);
+    box-shadow: 0 26px 44px rgba(56, 189, 248, 0.32);
+}
+.keyboard-key--tonic {
+    border-color: rgba(147, 51, 234, 0.85);
+    box-shadow: 0 28px 46px rgba(147, 51, 234, 0.35);
+}
+.keyboard-key--active {
+    transform: translateY(2px);
+    box-shadow: 0 30px 50px rgba(59, 130, 246, 0.4);
+}
+@media (max-width: 768px) {
+    .keyboard-keys {
+        gap: 0.7rem;
+        padding: 1rem 0.7rem 1.3rem;
+    }
+    .keyboard-octave-label {
+        font-size: 0.68rem;
+        letter-spacing: 0.1em;
+    }
+}
+"""
+
+_KEYBOARD_COMPONENT_JS = """
+export default function (component) {
+    const { data, setTriggerValue, parentElement } = component;
+    const keyButton = (key, type) =>
+        `<button type="button" class="keyboard-key keyboard-key--${type} ${key.classes}" data-note="${key.note}">${key.note}</button>`;
+    const root = parentElement.querySelector(".keyboard-keys");
+    root.innerHTML = data.octaves
+        .map(
+            (octave) =>
+                `<div class="keyboard-octave"><span class="keyboard-octave-label">${octave.label}</span>` +
+                `<div class="keyboard-octave-keys">` +
+                octave.keys
+                    .map(
+                        (key) =>
+                            `<div class="keyboard-slot">${keyButton(key, "white")}` +
+                            (key.sharp ? keyButton(key.sharp, "black") : "") +
+                            `</div>`
+                    )
+                    .join("") +
+                `</div></div>`
+        )
+        .join("");
+    root.onclick = (event) => {
+        const key = event.target.closest("button[data-note]");
+        if (key) {
+            setTriggerValue("pressed", key.dataset.note);
+        }
+    };
+}
+"""
+
+# Both octaves render inside one component instead of a column grid holding a
+# button per key, so a rerun sends a single element for the whole keyboard.
+_KEYBOARD_COMPONENT = st.components.v2.component(
+    "lofi_keyboard",
+    html="<div class='keyboard-keys'></div>",
+    css=_minify_css(_KEYBOARD_COMPONENT_CSS),
+    js=_KEYBOARD_COMPONENT_JS,
+)
+
+
+def _keyboard_key_classes(
+    note_name: str,
+    *,
+    scale_pitch_classes: set[int],
+    tonic_name: str,
+    last_pressed: str | None,
+) -> str:
+    classes = []
+    if _note_in_scale(note_name, scale_pitch_classes):
+        classes.append("keyboard-key--in-scale")
+    if _note_pitch_name(note_name) == tonic_name:
+        classes.append("keyboard-key--tonic")
+    if last_pressed == note_name:
+        classes.append("keyboard-key--active")
+    return " ".join(classes)
+
+
+@lru_cache(maxsize=64)
+def _keyboard_layout(tonic_name: str, scale: str, last_pressed: str | None) -> dict[str, Any]:
+    """Return the keyboard component payload with per-key highlight classes."""
+
+    scale_pitch_classes = _scale_pitch_classes(tonic_name, scale)
+
+    def key_payload(note_name: str) -> dict[str, str]:
+        classes = _keyboard_key_classes(
+            note_name,
+            scale_pitch_classes=scale_pitch_classes,
+            tonic_name=tonic_name,
+            last_pressed=last_pressed,
+        )
+        return {"note": note_name, "classes": classes}
+
+    octaves = []
+    for octave in KEYBOARD_OCTAVES:
+        keys = []
+        for white_note in octave["white"]:
+            accidental = octave["accidentals"].get(white_note)
+            keys.append({**key_payload(white_note), "sharp": key_payload(accidental) if accidental else None})
+        octaves.append({"label": octave["label"], "keys": keys})
+    return {"octaves": octaves}
+
+
+def _keyboard_block(settings: SessionSettings) -> None:
+    st.markdown("### Virtual keyboard")
+    st.caption("Click keys to play notes, build ideas, and capture takes.")
+
+    st.markdown(_KEYBOARD_CSS, unsafe_allow_html=True)
 
     tonic_name = _note_pitch_name(settings.key)
-    scale_pitch_classes = _scale_pitch_classes(tonic_name, settings.scale)
     last_pressed = st.session_state.get("last_pressed_note")
     tempo = settings.tempo
 
@@ -1673,111 +2254,43 @@ def _keyboard_block(settings: SessionSettings) -> None:
             max_value=127,
             value=int(st.session_state.get("keyboard_velocity", 95)),
         )
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    st.markdown("<div class='keyboard-keys-row'>", unsafe_allow_html=True)
-
-    def render_key(note_name: str, *, key_type: str, overlay: bool = False) -> None:
-        button_key = f"keyboard-{note_name}"
-        is_in_scale = _note_in_scale(note_name, scale_pitch_classes)
-        is_tonic = _note_pitch_name(note_name) == tonic_name
-        is_active = last_pressed == note_name
-
-        base_style: list[str]
-        border_colour: str
-        box_shadow: str
-
-        if key_type == "white":
-            base_style = [
-                "height: 170px;",
-                "border-radius: 18px;",
-                "background: linear-gradient(180deg, #ffffff 0%, #e2e8f0 100%);",
-                "color: #0f172a;",
-                "font-weight: 600;",
-                "font-size: 0.95rem;",
-                "display: flex;",
-                "align-items: flex-end;",
-                "justify-content: center;",
-                "padding-bottom: 14px;",
-                "width: 100% !important;",
-                "margin: 0 auto;",
-                "box-shadow: 0 22px 40px rgba(15, 23, 42, 0.5);",
-                "border: 1.5px solid rgba(148, 163, 184, 0.35);",
-            ]
-            border_colour = "rgba(148, 163, 184, 0.35)"
-            box_shadow = "0 22px 40px rgba(15, 23, 42, 0.5)"
-        else:
-            base_style = [
-                "height: 120px;",
-                "border-radius: 14px;",
-                "background: linear-gradient(180deg, #0b1120 0%, #111827 100%);",
-                "color: #e0f2fe;",
-                "font-weight: 600;",
-                "font-size: 0.85rem;",
-                "display: flex;",
-                "align-items: flex-end;",
-                "justify-content: center;",
-                "padding-bottom: 10px;",
-                "width: 74% !important;",
-                "margin: 0 auto;",
-                "margin-bottom: -86px;",
-                "position: relative;",
-                "top: 26px;",
-                "z-index: 4;",
-                "box-shadow: 0 28px 44px rgba(15, 23, 42, 0.65);",
-                "border: 1.5px solid rgba(30, 41, 59, 0.7);",
-            ]
-            if overlay:
-                base_style.append("align-self: center;")
-            border_colour = "rgba(30, 41, 59, 0.7)"
-            box_shadow = "0 28px 44px rgba(15, 23, 42, 0.65)"
-
-        if is_in_scale:
-            border_colour = "rgba(56, 189, 248, 0.75)"
-            box_shadow = "0 26px 44px rgba(56, 189, 248, 0.32)"
-        if is_tonic:
-            border_colour = "rgba(147, 51, 234, 0.85)"
-            box_shadow = "0 28px 46px rgba(147, 51, 234, 0.35)"
-        if is_active:
-            base_style.append("transform: translateY(2px);")
-            box_shadow = "0 30px 50px rgba(59, 130, 246, 0.4)"
-
-        base_style.append(f"border: 1.5px solid {border_colour};")
-        base_style.append(f"box-shadow: {box_shadow};")
-        base_style.append("transition: transform 0.12s ease, box-shadow 0.12s ease, border-color 0.12s ease;")
-
-        st.markdown(
-            f"<style>div[data-testid='stButton'][key='{button_key}'] button {{{' '.join(base_style)}}}</style>",
-            unsafe_allow_html=True,
-        )
+        st.markdown(_DIV_CLOSE, unsafe_allow_html=True)
+
+    # Triggers are only surfaced for events with a registered callback; the
+    # press itself is read from the result so it lands with the current tempo.
+    keys = _KEYBOARD_COMPONENT(
+        data=_keyboard_layout(tonic_name, settings.scale, last_pressed),
+        key="keyboard_keys",
+        on_pressed_change=lambda: None,
+    )
+    if keys.pressed in _KEYBOARD_PITCHES:
+        _register_keyboard_note(keys.pressed, tempo)
 
-        if st.button(note_name, key=button_key):
-            _register_keyboard_note(note_name, tempo)
-
-    octave_columns = st.columns(len(KEYBOARD_OCTAVES), gap="large")
-    for column, octave in zip(octave_columns, KEYBOARD_OCTAVES):
-        with column:
-            st.markdown("<div class='keyboard-octave'>", unsafe_allow_html=True)
-            st.markdown(f"<span class='keyboard-octave-label'>{octave['label']}</span>", unsafe_allow_html=True)
-            key_columns = st.columns(len(octave["white"]), gap="small")
-            for key_column, white_note in zip(key_columns, octave["white"]):
-                with key_column:
-                    st.markdown("<div class='keyboard-key-stack'>", unsafe_allow_html=True)
-                    accidental = octave["accidentals"].get(white_note)
-                    if accidental:
-                        render_key(accidental, key_type="black", overlay=True)
-                    render_key(white_note, key_type="white")
-                    st.markdown("</div>", unsafe_allow_html=True)
-            st.markdown("</div>", unsafe_allow_html=True)
-
-    st.markdown("</div>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(_DIV_CLOSE, unsafe_allow_html=True)
 
     preview_placeholder = st.empty()
     preview_payload = st.session_state.pop("keyboard_preview_audio", None)
     if preview_payload:
         preview_placeholder.audio(preview_payload, format="audio/wav")
 
+
+_MIDI_DRAIN_SECONDS = 0.25
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _midi_input_ports(_manager: MidiInputManager) -> list[str]:
+    """Enumerate system MIDI inputs at most every few seconds; the port list is process-wide."""
+
+    return list(_manager.list_input_ports())
+
+
+@st.fragment(run_every=_MIDI_DRAIN_SECONDS)
+def _midi_drain(manager: MidiInputManager, tempo: int) -> None:
+    """Move queued messages from the listener thread onto the timeline between full reruns."""
+
+    manager.drain(lambda msg: _handle_midi_message(msg, tempo))
+
+
 def _midi_block(tempo: int) -> None:
     st.markdown("### USB MIDI input")
     manager: MidiInputManager | None = st.session_state.midi_manager
@@ -1786,7 +2299,7 @@ def _midi_block(tempo: int) -> None:
         st.info("Install `mido` and `python-rtmidi` to unlock USB MIDI capture.")
         return
 
-    ports = list(manager.list_input_ports())
+    ports = _midi_input_ports(manager)
     selected_port = st.selectbox("Available ports", ports or ["None detected"], disabled=not ports)
 
     col1, col2 = st.columns(2)
@@ -1802,7 +2315,7 @@ def _midi_block(tempo: int) -> None:
     st.caption(f"Status: {st.session_state.midi_status}")
 
     if st.session_state.midi_status == "Connected":
-        manager.drain(lambda msg: _handle_midi_message(msg, tempo))
+        _midi_drain(manager, tempo)
 
 
 def _recording_controls(tempo: int) -> None:
@@ -1823,7 +2336,7 @@ def _recording_controls(tempo: int) -> None:
             st.toast("Recording started – play from your MIDI keyboard or the on-screen keys.")
         else:
             st.session_state.recording = False
-            st.session_state.midi_note_starts.clear()
+            st.session_state.midi_note_starts[:] = _NO_NOTE_STARTS
             st.toast("Recording stopped – notes landed on the timeline.")
 
     st.caption(
@@ -1831,49 +2344,98 @@ def _recording_controls(tempo: int) -> None:
     )
 
 
-def _timeline_plot(timeline: Timeline) -> go.Figure:
-    fig = go.Figure()
-    if len(timeline.events) == 0:
+_TIMELINE_PLOT_LAYOUT = dict(
+    height=340,
+    bargap=0.2,
+    template="plotly_dark",
+    xaxis_title="Beats",
+    yaxis_title="Instrument",
+    plot_bgcolor="rgba(15,23,42,0.6)",
+    paper_bgcolor="rgba(15,23,42,0)",
+)
+_EMPTY_PLOT_LAYOUT = dict(height=220, xaxis=dict(visible=False), yaxis=dict(visible=False))
+_TIMELINE_PALETTE = ("#a855f7", "#f472b6", "#38bdf8", "#34d399", "#facc15", "#fb7185")
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _timeline_plot(signature: int, _timeline: Timeline) -> go.Figure:
+    """Build the clip overview figure, cached on :meth:`Timeline.signature`.
+
+    ``st.cache_data`` hands every rerun its own copy, so a caller that tweaks
+    the figure cannot leak the change into other sessions' charts.
+    """
+
+    import plotly.graph_objects as go
+
+    events = _timeline.events
+    if not events:
+        fig = go.Figure(layout=_EMPTY_PLOT_LAYOUT)
         fig.add_annotation(text="No clips yet", showarrow=False, font=dict(color="#94a3b8", size=18))
-        fig.update_layout(height=220, xaxis=dict(visible=False), yaxis=dict(visible=False))
         return fig
 
-    instruments = sorted({event.instrument for event in timeline.events})
-    palette = ["#a855f7", "#f472b6", "#38bdf8", "#34d399", "#facc15", "#fb7185"]
-
-    for idx, event in enumerate(timeline.events):
-        color = palette[idx % len(palette)]
-        fig.add_trace(
-            go.Bar(
-                x=[event.duration],
-                y=[event.instrument],
-                base=[event.start],
-                orientation="h",
-                marker=dict(color=color, opacity=0.85),
-                name=f"{event.instrument} ({event.pitch})",
-                hovertemplate="Instrument: %{y}<br>Start: %{base} beats<br>Length: %{x} beats<br>Pitch: %{text}",
-                text=[event.pitch],
-                showlegend=False,
-            )
-        )
-
-    fig.update_layout(
-        height=340,
-        bargap=0.2,
-        template="plotly_dark",
-        xaxis_title="Beats",
-        yaxis_title="Instrument",
-        plot_bgcolor="rgba(15,23,42,0.6)",
-        paper_bgcolor="rgba(15,23,42,0)",
+    count = len(events)
+    starts = np.fromiter((event.start for event in events), dtype=np.float64, count=count)
+    durations = np.fromiter((event.duration for event in events), dtype=np.float64, count=count)
+    pitches = np.fromiter((event.pitch for event in events), dtype=np.int64, count=count)
+    instruments = [event.instrument for event in events]
+    # One colour per instrument lane so clips of the same track read as a group.
+    lane_colors = dict(zip(_timeline.instruments(), itertools.cycle(_TIMELINE_PALETTE)))
+    colors = [lane_colors[instrument] for instrument in instruments]
+
+    fig = go.Figure(
+        data=go.Bar(
+            x=durations,
+            y=instruments,
+            base=starts,
+            orientation="h",
+            marker=dict(color=colors, opacity=0.85),
+            hovertemplate="Instrument: %{y}<br>Start: %{base} beats<br>Length: %{x} beats<br>Pitch: %{text}<extra></extra>",
+            text=pitches,
+            showlegend=False,
+        ),
+        layout=_TIMELINE_PLOT_LAYOUT,
     )
     return fig
 
 
+@st.cache_data(max_entries=8, show_spinner=False)
+def _timeline_json(signature: int, _timeline: Timeline) -> bytes:
+    """Serialise the timeline for download once per :meth:`Timeline.signature`."""
+
+    return _timeline.to_json_bytes()
+
+
+# Timeline edit buttons mutate state in on_click callbacks, which run before
+# the script, so the same rerun already renders the updated timeline.
+def _quantize_timeline(grid: float) -> None:
+    st.session_state.timeline.quantize(grid)
+    st.session_state.arrangement_sections = None
+
+
+def _clear_timeline() -> None:
+    st.session_state.timeline = Timeline()
+    _update_timeline_cursor()
+    st.session_state.arrangement_sections = None
+    st.session_state.arranger_lanes = []
+    st.session_state.arranger_lanes_source = None
+
+
+def _duplicate_timeline() -> None:
+    timeline: Timeline = st.session_state.timeline
+    if not timeline.events:
+        return
+    timeline.duplicate_shift()
+    _update_timeline_cursor()
+    st.session_state.arrangement_sections = None
+
+
 def _timeline_tab(settings: SessionSettings) -> None:
+    import pandas as pd
+
     tempo = settings.tempo
     timeline: Timeline = st.session_state.timeline
 
-    st.markdown("<div class='lofi-card'>", unsafe_allow_html=True)
+    st.markdown(_CARD_OPEN, unsafe_allow_html=True)
     st.subheader("Timeline editor", divider="rainbow")
     st.markdown("Tune takes, quantize and render your arrangement.")
 
@@ -1887,12 +2449,11 @@ def _timeline_tab(settings: SessionSettings) -> None:
         )
         if uploaded_timeline is not None:
             try:
-                payload = json.loads(uploaded_timeline.getvalue().decode("utf-8"))
-                events = [TimelineEvent.from_dict(event) for event in payload]
+                restored_timeline = Timeline.from_json_bytes(uploaded_timeline.getvalue())
             except (json.JSONDecodeError, KeyError, TypeError, ValueError) as exc:
                 st.error(f"Unable to import timeline JSON: {exc}.")
             else:
-                st.session_state.timeline = Timeline(events)
+                st.session_state.timeline = restored_timeline
                 _update_timeline_cursor()
                 st.session_state.generated_midi = None
                 st.session_state.generated_audio = None
@@ -1923,8 +2484,8 @@ def _timeline_tab(settings: SessionSettings) -> None:
                 st.rerun()
 
     if timeline.events:
-        timeline_instruments = sorted({event.instrument for event in timeline.events})
-        max_end = max(event.start + event.duration for event in timeline.events)
+        timeline_instruments = timeline.instruments()
+        max_end = timeline.max_end
         st.markdown(
             f"""
             <div class="progression-card" style="margin-top: 0.75rem;">
@@ -1933,7 +2494,7 @@ def _timeline_tab(settings: SessionSettings) -> None:
                     <span class="progression-meta">{len(timeline.events)} clips • {max_end:.1f} beats</span>
                 </div>
                 <div style="display: flex; flex-wrap: wrap; gap: 0.5rem;">
-                    {''.join(f"<span class='instrument-tag'>🎚️ {name}</span>" for name in timeline_instruments)}
+                    {_chips_html(_INSTRUMENT_TAG_OPEN, timeline_instruments)}
                 </div>
             </div>
             """,
@@ -1953,52 +2514,28 @@ def _timeline_tab(settings: SessionSettings) -> None:
         grid_options = [0.25, 0.5, 1.0]
         grid_labels = {0.25: "16th notes", 0.5: "8th notes", 1.0: "Quarter notes"}
         grid = st.selectbox("Quantize grid", grid_options, format_func=lambda v: grid_labels[v])
-        if st.button("Quantize"):
-            st.session_state.timeline.quantize(grid)
-            st.session_state.arrangement_sections = None
-            st.rerun()
+        st.button("Quantize", on_click=_quantize_timeline, args=(grid,))
     with col2:
-        if st.button("Clear timeline"):
-            st.session_state.timeline = Timeline()
-            _update_timeline_cursor()
-            st.session_state.arrangement_sections = None
-            st.session_state.arranger_lanes = []
-            st.rerun()
+        st.button("Clear timeline", on_click=_clear_timeline)
     with col3:
-        if st.button("Duplicate last bar") and timeline.events:
-            last_end = max(event.start + event.duration for event in timeline.events)
-            new_events = [
-                TimelineEvent(
-                    start=event.start + last_end,
-                    duration=event.duration,
-                    pitch=event.pitch,
-                    velocity=event.velocity,
-                    instrument=event.instrument,
-                )
-                for event in timeline.events
-            ]
-            st.session_state.timeline.extend(new_events)
-            _update_timeline_cursor()
-            st.session_state.arrangement_sections = None
-            st.rerun()
+        st.button("Duplicate last bar", on_click=_duplicate_timeline)
 
-    st.plotly_chart(_timeline_plot(st.session_state.timeline), use_container_width=True)
+    st.plotly_chart(_timeline_plot(timeline.signature(), timeline), use_container_width=True)
 
     if not st.session_state.timeline.events:
         st.info("Add clips via the generator or performance desk to render the timeline.")
-        st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown(_DIV_CLOSE, unsafe_allow_html=True)
         return
 
     playback_timeline = _arranger_filtered_timeline(st.session_state.timeline)
     if not playback_timeline.events:
         st.warning("All tracks are muted or soloed away; nothing to render. Enable a track to export audio.")
     else:
-        midi_obj = playback_timeline.to_pretty_midi(tempo)
-        _apply_arranger_midi_mix(midi_obj)
-        midi_bytes = io.BytesIO()
-        midi_obj.write(midi_bytes)
-        midi_bytes.seek(0)
-        st.download_button("Download timeline MIDI", midi_bytes, file_name="timeline.mid", mime="audio/midi")
+        render_future = _timeline_render_future(
+            (playback_timeline.signature(), tempo, _arranger_mix_signature(), settings.vinyl_fx),
+            playback_timeline,
+        )
+        wait((render_future,), timeout=_RENDER_GRACE_SECONDS)
 
         if not _fluidsynth_available() or not _soundfont_available():
             st.info(
@@ -2009,52 +2546,85 @@ def _timeline_tab(settings: SessionSettings) -> None:
             st.caption(
                 "Vinyl texture adds a noise bed to the WAV preview. Toggle it off in Session DNA for a clean render."
             )
-        audio_segment = midi_to_audio(
-            io.BytesIO(midi_bytes.getvalue()),
-            add_vinyl_fx=settings.vinyl_fx,
-            instrument_effects=_arranger_effects_map(),
-        )
-        audio_buffer = io.BytesIO()
-        audio_segment.export(audio_buffer, format="wav")
-        audio_buffer.seek(0)
-        st.audio(audio_buffer)
-        st.download_button(
-            "Download timeline WAV",
-            data=audio_buffer.getvalue(),
-            file_name="timeline.wav",
-            mime="audio/wav",
-        )
 
-    json_payload = json.dumps([event.to_dict() for event in st.session_state.timeline.events], indent=2).encode("utf-8")
+        if not render_future.done():
+            _await_background(
+                render_future, "Rendering timeline audio in the background — the preview appears here when it is ready."
+            )
+        elif render_future.exception() is not None:
+            st.error(f"Unable to render the timeline: {render_future.exception()}")
+        else:
+            midi_payload, wav_payload = render_future.result()
+            st.download_button("Download timeline MIDI", midi_payload, file_name="timeline.mid", mime="audio/midi")
+            st.audio(wav_payload, format="audio/wav")
+            st.download_button(
+                "Download timeline WAV",
+                data=wav_payload,
+                file_name="timeline.wav",
+                mime="audio/wav",
+            )
+
+    json_payload = _timeline_json(timeline.signature(), timeline)
     st.download_button(
         "Download timeline JSON",
         data=json_payload,
         file_name="timeline.json",
         mime="application/json",
     )
-    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(_DIV_CLOSE, unsafe_allow_html=True)
 
 
 def _performance_tab(settings: SessionSettings) -> None:
     tempo = settings.tempo
-    st.markdown("<div class='lofi-card'>", unsafe_allow_html=True)
+    st.markdown(_CARD_OPEN, unsafe_allow_html=True)
     st.subheader("Performance desk", divider="rainbow")
     _recording_controls(tempo)
     st.divider()
     _keyboard_block(settings)
     st.divider()
     _midi_block(tempo)
-    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(_DIV_CLOSE, unsafe_allow_html=True)
+
+
+def _arranger_roadmap_html(sections: Sequence[dict[str, Any]]) -> str:
+    rows = [
+        f"<tr><td>{html.escape(str(section.get('name')))}</td>"
+        f"<td>{section.get('start_bar', 0)}</td><td>{section.get('n_bars', 0)}</td>"
+        f"<td>{html.escape(', '.join(section.get('instruments', [])) or 'None')}</td>"
+        f"<td>{'Yes' if section.get('has_hook') else 'No'}</td></tr>"
+        for section in sections
+    ]
+    return f"""
+        <div style="margin-top: 1.5rem;">
+            <h4 style="color: #cbd5f5; margin-bottom: 0.35rem;">Arrangement roadmap</h4>
+            <table class="arranger-table">
+                <thead>
+                    <tr>
+                        <th>Section</th>
+                        <th>Start bar</th>
+                        <th>Length</th>
+                        <th>Instruments</th>
+                        <th>Hook</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    {''.join(rows)}
+                </tbody>
+            </table>
+        </div>
+        """
 
 
 def _arranger_tab(settings: SessionSettings) -> None:
+    import pandas as pd
+
     sections = st.session_state.get("arrangement_sections") or []
     _initialise_arranger_state(sections)
     tracks = st.session_state.arranger_tracks
     timeline: Timeline = st.session_state.timeline
     metadata = st.session_state.get("generator_metadata") or {}
 
-    st.markdown("<div class='lofi-card'>", unsafe_allow_html=True)
+    st.markdown(_CARD_OPEN, unsafe_allow_html=True)
     st.subheader("Arranger desk", divider="rainbow")
     st.caption(
         "Balance stems, automate sections and reshuffle clip lanes. These controls feed directly into playback and exports."
@@ -2065,7 +2635,7 @@ def _arranger_tab(settings: SessionSettings) -> None:
         palette = metadata.get("palette", settings.palette)
         tempo = metadata.get("tempo", settings.tempo)
         tonality = f"{metadata.get('key', settings.key)} {str(metadata.get('scale', settings.scale)).title()}"
-        chord_html = "".join(f"<span class='progression-chip'>{chord}</span>" for chord in chords)
+        chord_html = _chips_html(_PROGRESSION_CHIP_OPEN, chords)
         st.markdown(
             f"""
             <div class="progression-card" style="margin-bottom: 1rem;">
@@ -2083,67 +2653,71 @@ def _arranger_tab(settings: SessionSettings) -> None:
 
     st.markdown("### Mixer controls")
     solo_active = any(track.get("solo") for track in tracks)
-    for idx, track in enumerate(tracks):
-        track_key = f"{track['name'].lower().replace(' ', '-')}-{idx}"
-        container = st.container()
-        with container:
-            st.markdown(f"#### {track['name']} <small style='color:#94a3b8;'>({track['instrument']})</small>", unsafe_allow_html=True)
-            col1, col2, col3 = st.columns([1.1, 1.2, 1.7])
-
-            mute_key = f"arranger-mute-{track_key}"
-            solo_key = f"arranger-solo-{track_key}"
-            volume_key = f"arranger-volume-{track_key}"
-            pan_key = f"arranger-pan-{track_key}"
-            fx_key = f"arranger-fx-{track_key}"
-
-            mute_default = not track.get("enabled", True)
-            solo_default = track.get("solo", False)
-            volume_default = track.get("volume", 100)
-            pan_default = track.get("pan", 0)
-            effects_default = track.get("effects", [])
-
-            mute = col1.toggle("Mute", value=mute_default, key=mute_key)
-            solo = col1.toggle("Solo", value=solo_default, key=solo_key)
-
-            volume = col2.slider("Volume", min_value=0, max_value=120, value=volume_default, key=volume_key)
-            pan = col2.slider("Pan", min_value=-50, max_value=50, value=pan_default, format="%d", key=pan_key)
-
-            effects = col3.multiselect(
-                "Effects rack",
-                EFFECT_PRESETS,
-                default=effects_default,
-                key=fx_key,
-                help="Add flavour to this track. The playlist metadata carries these labels into exports.",
-            )
+    if not tracks:
+        st.info("No tracks to mix yet. Generate an arrangement or add clips to the timeline to populate the desk.")
+    else:
+        for idx, track in enumerate(tracks):
+            track_key = f"{track['name'].lower().replace(' ', '-')}-{idx}"
+            container = st.container()
+            with container:
+                st.markdown(f"#### {track['name']} <small style='color:#94a3b8;'>({track['instrument']})</small>", unsafe_allow_html=True)
+                col1, col2, col3 = st.columns([1.1, 1.2, 1.7])
+
+                mute_key = f"arranger-mute-{track_key}"
+                solo_key = f"arranger-solo-{track_key}"
+                volume_key = f"arranger-volume-{track_key}"
+                pan_key = f"arranger-pan-{track_key}"
+                fx_key = f"arranger-fx-{track_key}"
+
+                mute_default = not track.get("enabled", True)
+                solo_default = track.get("solo", False)
+                volume_default = track.get("volume", 100)
+                pan_default = track.get("pan", 0)
+                effects_default = track.get("effects", [])
+
+                mute = col1.toggle("Mute", value=mute_default, key=mute_key)
+                solo = col1.toggle("Solo", value=solo_default, key=solo_key)
+
+                volume = col2.slider("Volume", min_value=0, max_value=120, value=volume_default, key=volume_key)
+                pan = col2.slider("Pan", min_value=-50, max_value=50, value=pan_default, format="%d", key=pan_key)
+
+                effects = col3.multiselect(
+                    "Effects rack",
+                    EFFECT_PRESETS,
+                    default=effects_default,
+                    key=fx_key,
+                    help="Add flavour to this track. The playlist metadata carries these labels into exports.",
+                )
 
-            automation_key_prefix = f"arranger-automation-{track_key}"
-            automation_map = track.get("automation", {})
-            with col3.expander("Automation by section"):
-                for section_name in section_names:
-                    slider_key = f"{automation_key_prefix}-{section_name}"
-                    default_value = automation_map.get(section_name, ARRANGER_AUTOMATION_DEFAULT)
-                    automation_value = st.slider(
-                        section_name,
-                        min_value=0,
-                        max_value=127,
-                        value=default_value,
-                        key=slider_key,
-                        help="Adjust relative intensity per section (applied to MIDI velocity).",
-                    )
-                    automation_map[section_name] = automation_value
-
-            track["enabled"] = not mute
-            track["solo"] = solo
-            track["volume"] = volume
-            track["pan"] = pan
-            track["effects"] = effects
-            track["automation"] = automation_map
-
-            if effects:
-                fx_html = "".join(f"<span class='arranger-chip'>{effect}</span>" for effect in effects)
-                st.markdown(f"<div style='margin-top:0.4rem;'>Active FX: {fx_html}</div>", unsafe_allow_html=True)
-            else:
-                st.markdown("<div style='margin-top:0.4rem; color:#64748b;'>Active FX: None</div>", unsafe_allow_html=True)
+                automation_key_prefix = f"arranger-automation-{track_key}"
+                automation_map = track.get("automation", {})
+                with col3.expander("Automation by section"):
+                    for section_name in section_names:
+                        slider_key = f"{automation_key_prefix}-{section_name}"
+                        default_value = automation_map.get(section_name, ARRANGER_AUTOMATION_DEFAULT)
+                        automation_value = st.slider(
+                            section_name,
+                            min_value=0,
+                            max_value=127,
+                            value=default_value,
+                            key=slider_key,
+                            help="Adjust relative intensity per section (applied to MIDI velocity).",
+                        )
+                        automation_map[section_name] = automation_value
+
+                track["enabled"] = not mute
+                track["solo"] = solo
+                track["volume"] = volume
+                track["pan"] = pan
+                track["effects"] = effects
+                track["automation"] = automation_map
+
+                if effects:
+                    fx_html = _chips_html(_ARRANGER_CHIP_OPEN, effects)
+                    st.markdown(f"<div style='margin-top:0.4rem;'>Active FX: {fx_html}</div>", unsafe_allow_html=True)
+                else:
+                    st.markdown("<div style='margin-top:0.4rem; color:#64748b;'>Active FX: None</div>", unsafe_allow_html=True)
+        solo_active = any(track.get("solo") for track in tracks)
 
     st.session_state.arranger_tracks = tracks
 
@@ -2156,13 +2730,12 @@ def _arranger_tab(settings: SessionSettings) -> None:
     track_map = _arranger_tracks_map()
 
     if lanes:
-        prepared_records: list[dict[str, Any]] = []
-        for record in lanes:
-            base = dict(record)
-            effects = track_map.get(base.get("Instrument", ""), {}).get("effects", [])
-            base["Effects"] = ", ".join(effects) if effects else "—"
-            prepared_records.append(base)
-        lane_df = pd.DataFrame(prepared_records).sort_values("Order").reset_index(drop=True)
+        lanes_key = _lane_key(lanes)
+        lane_rows = []
+        for row in lanes_key:
+            effects = track_map.get(row[2] or "", {}).get("effects", [])
+            lane_rows.append((*row, ", ".join(effects) if effects else "—"))
+        lane_df = _build_lane_frame(tuple(lane_rows))
         st.caption("Drag row handles to reorder lanes. Edit start/length to reshape sections across instruments.")
         column_config = {
             "Order": st.column_config.NumberColumn("Order", disabled=True),
@@ -2195,8 +2768,9 @@ def _arranger_tab(settings: SessionSettings) -> None:
                         "Length (beats)": float(record.get("Length (beats)", BEATS_PER_BAR * 4)),
                     }
                 )
-            if normalised_records != st.session_state.arranger_lanes:
+            if _lane_key(normalised_records) != lanes_key:
                 st.session_state.arranger_lanes = normalised_records
+                st.session_state.arranger_lanes_source = None
                 _update_sections_from_lanes(normalised_records)
                 st.toast("Arranger lanes updated")
     else:
@@ -2204,35 +2778,8 @@ def _arranger_tab(settings: SessionSettings) -> None:
 
     current_sections = st.session_state.get("arrangement_sections") or []
     if current_sections:
-        rows = []
-        for section in current_sections:
-            start = section.get("start_bar", 0)
-            n_bars = section.get("n_bars", 0)
-            instruments = ", ".join(section.get("instruments", [])) or "None"
-            hook_flag = "Yes" if section.get("has_hook") else "No"
-            rows.append(
-                f"<tr><td>{section.get('name')}</td><td>{start}</td><td>{n_bars}</td><td>{instruments}</td><td>{hook_flag}</td></tr>"
-            )
         st.markdown(
-            f"""
-            <div style="margin-top: 1.5rem;">
-                <h4 style="color: #cbd5f5; margin-bottom: 0.35rem;">Arrangement roadmap</h4>
-                <table class="arranger-table">
-                    <thead>
-                        <tr>
-                            <th>Section</th>
-                            <th>Start bar</th>
-                            <th>Length</th>
-                            <th>Instruments</th>
-                            <th>Hook</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {''.join(rows)}
-                    </tbody>
-                </table>
-            </div>
-            """,
+            _memoised_html("arranger_roadmap_html", current_sections, _arranger_roadmap_html),
             unsafe_allow_html=True,
         )
 
@@ -2241,18 +2788,88 @@ def _arranger_tab(settings: SessionSettings) -> None:
     else:
         st.info("Generate a progression or record a take to populate the arranger.")
 
-    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(_DIV_CLOSE, unsafe_allow_html=True)
+
+
+def _run_generator(kind: Literal["progression", "arrangement"], settings: SessionSettings) -> None:
+    """Generate MIDI for ``kind``, load it into the timeline and rerun the app.
+
+    ``"progression"`` appends a single progression to the current timeline and
+    re-quantizes it; ``"arrangement"`` replaces the timeline with a structured song.
+    """
+
+    song_kwargs = dict(
+        key=settings.key,
+        scale=settings.scale,
+        tempo=settings.tempo,
+        lofi_type=settings.palette,
+        rhythm=settings.rhythm,
+        mood=settings.mood,
+        instruments=settings.instruments,
+    )
+    metadata: dict[str, Any] = {
+        "palette": settings.palette,
+        "mood": settings.mood,
+        "tempo": settings.tempo,
+        "key": settings.key,
+        "scale": settings.scale,
+        "instruments": settings.instruments,
+    }
+
+    serialised_sections: list[dict[str, Any]] | None = None
+    if kind == "progression":
+        progression_pool = _PROGRESSION_POOLS.get(settings.palette, _DEFAULT_PROGRESSION_POOL)
+        progression_choice = progression_pool[_PROGRESSION_RNG.integers(len(progression_pool))]
+        midi_payload = generate_lofi_midi(**song_kwargs, progression=progression_choice).getvalue()
+        metadata["progression"] = progression_choice
+        st.session_state.arrangement_sections = None
+        _ingest_midi_into_timeline(midi_payload)
+        st.session_state.timeline.quantize(0.25)
+        toast = "MIDI idea injected into the timeline ✨"
+    else:
+        sections: list[SectionArrangement]
+        midi_stream, sections = generate_structured_song(**song_kwargs)
+        midi_payload = midi_stream.getvalue()
+        st.session_state.timeline = Timeline()
+        _ingest_midi_into_timeline(midi_payload, grid=0.25)
+        serialised_sections = []
+        hook_motif: list[str] = []
+        for section in sections:
+            section_dict = section.to_dict()
+            serialised_sections.append(section_dict)
+            if not hook_motif and section_dict["has_hook"] and section_dict["hook_motif"]:
+                hook_motif = section_dict["hook_motif"]
+        st.session_state.arrangement_sections = serialised_sections
+        metadata["progression"] = sections[0].progression if sections else []
+        metadata["hook_motif"] = hook_motif
+        toast = "Structured arrangement added to the timeline 🎼"
+
+    st.session_state.generated_midi = midi_payload
+    st.session_state.generator_metadata = metadata
+    _initialise_arranger_state(serialised_sections, reset_lanes=True)
+    st.session_state.generated_audio = _render_midi_to_wav(
+        midi_payload, settings.vinyl_fx, _arranger_effects_map()
+    )
+    st.session_state.generator_toast = toast
+    st.rerun()
 
 
+@st.fragment
 def _generator_tab(settings: SessionSettings) -> None:
+    """Generator tab, run as a fragment so its own widgets only rerun this tab.
+
+    Actions that change the timeline trigger a full app rerun so the other tabs
+    and the session overview pick up the new material.
+    """
+
+    pending_toast = st.session_state.pop("generator_toast", None)
+    if pending_toast:
+        st.toast(pending_toast)
     selected_key = settings.key
     selected_scale = settings.scale
-    selected_type = settings.palette
-    selected_mood = settings.mood
     selected_tempo = settings.tempo
-    selected_rhythm = settings.rhythm
     selected_instruments = settings.instruments
-    st.markdown("<div class='lofi-card'>", unsafe_allow_html=True)
+    st.markdown(_CARD_OPEN, unsafe_allow_html=True)
     st.subheader("AI-assisted ideas", divider="rainbow")
 
     st.caption("Pair curated MIDI seeds with Audiocraft layers to sketch tracks in minutes.")
@@ -2262,86 +2879,9 @@ def _generator_tab(settings: SessionSettings) -> None:
         st.markdown("### Generate MIDI scaffold")
         st.caption("Roll harmonic DNA tailored to your palette and drop it straight on the timeline.")
         if st.button("🎶 Generate progression", use_container_width=True):
-            progression_pool = TYPE_PROGRESSIONS.get(selected_type, TYPE_PROGRESSIONS["Chillhop"])
-            progression_choice = random.choice(progression_pool)
-            midi_bytes = generate_lofi_midi(
-                key=selected_key,
-                scale=selected_scale,
-                tempo=selected_tempo,
-                lofi_type=selected_type,
-                rhythm=selected_rhythm,
-                mood=selected_mood,
-                instruments=selected_instruments,
-                progression=progression_choice,
-            )
-            midi_payload = midi_bytes.getvalue()
-            st.session_state.generated_midi = midi_payload
-            st.session_state.generator_metadata = {
-                "progression": progression_choice,
-                "palette": selected_type,
-                "mood": selected_mood,
-                "tempo": selected_tempo,
-                "key": selected_key,
-                "scale": selected_scale,
-                "instruments": list(selected_instruments),
-            }
-            st.session_state.arrangement_sections = None
-            _ingest_midi_into_timeline(midi_payload)
-            st.session_state.timeline.quantize(0.25)
-            _initialise_arranger_state(st.session_state.arrangement_sections, reset_lanes=True)
-            audio_segment = midi_to_audio(
-                io.BytesIO(midi_payload),
-                add_vinyl_fx=settings.vinyl_fx,
-                instrument_effects=_arranger_effects_map(),
-            )
-            audio_buffer = io.BytesIO()
-            audio_segment.export(audio_buffer, format="wav")
-            audio_buffer.seek(0)
-            st.session_state.generated_audio = audio_buffer.getvalue()
-            st.toast("MIDI idea injected into the timeline ✨")
-
+            _run_generator("progression", settings)
         if st.button("🧱 Generate full arrangement", use_container_width=True):
-            sections: list[SectionArrangement]
-            midi_stream, sections = generate_structured_song(
-                key=selected_key,
-                scale=selected_scale,
-                tempo=selected_tempo,
-                lofi_type=selected_type,
-                rhythm=selected_rhythm,
-                mood=selected_mood,
-                instruments=selected_instruments,
-            )
-            midi_payload = midi_stream.getvalue()
-            st.session_state.timeline = Timeline()
-            _ingest_midi_into_timeline(midi_payload)
-            st.session_state.timeline.quantize(0.25)
-            st.session_state.generated_midi = midi_payload
-            st.session_state.arrangement_sections = [section.to_dict() for section in sections]
-            st.session_state.generator_metadata = {
-                "progression": sections[0].progression if sections else [],
-                "palette": selected_type,
-                "mood": selected_mood,
-                "tempo": selected_tempo,
-                "key": selected_key,
-                "scale": selected_scale,
-                "instruments": list(selected_instruments),
-                "arrangement": st.session_state.arrangement_sections,
-                "hook_motif": next(
-                    (section["hook_motif"] for section in st.session_state.arrangement_sections if section["has_hook"] and section["hook_motif"]),
-                    [],
-                ),
-            }
-            _initialise_arranger_state(st.session_state.arrangement_sections, reset_lanes=True)
-            audio_segment = midi_to_audio(
-                io.BytesIO(midi_payload),
-                add_vinyl_fx=settings.vinyl_fx,
-                instrument_effects=_arranger_effects_map(),
-            )
-            audio_buffer = io.BytesIO()
-            audio_segment.export(audio_buffer, format="wav")
-            audio_buffer.seek(0)
-            st.session_state.generated_audio = audio_buffer.getvalue()
-            st.toast("Structured arrangement added to the timeline 🎼")
+            _run_generator("arrangement", settings)
 
         metadata = st.session_state.generator_metadata
         if metadata:
@@ -2350,13 +2890,15 @@ def _generator_tab(settings: SessionSettings) -> None:
         if arrangement_sections:
             _render_arrangement_overview(arrangement_sections)
 
-        audio_bytes = st.session_state.generated_audio
+        wav_bytes: bytes | None = st.session_state.generated_audio
         midi_bytes_payload = st.session_state.generated_midi
-        if audio_bytes:
-            st.audio(io.BytesIO(audio_bytes))
+        if wav_bytes:
+            # Streamlit's media manager keys uploads on content, so passing the
+            # same bytes on later reruns does not resend the WAV to the browser.
+            st.audio(wav_bytes, format="audio/wav")
             st.download_button(
                 "Download generated WAV",
-                data=audio_bytes,
+                data=wav_bytes,
                 file_name="lofi_idea.wav",
                 mime="audio/wav",
                 key="download-generated-wav",
@@ -2393,26 +2935,33 @@ def _generator_tab(settings: SessionSettings) -> None:
             key="musicgen-duration",
         )
         if st.button("✨ Render with MusicGen", use_container_width=True):
-            try:
-                with st.spinner("Rendering with Audiocraft..."):
-                    audio_path = render_musicgen(
-                        AudiocraftSettings(
-                            model=_active_musicgen_model(),
-                            prompt=prompt,
-                            duration=duration,
-                        )
-                    )
+            model = _active_musicgen_model()
+            st.session_state.musicgen_future = _musicgen_jobs().submit(
+                ("preview", model, prompt, duration),
+                render_musicgen,
+                AudiocraftSettings(model=model, prompt=prompt, duration=duration),
+                validate=Path.exists,
+            )
+        try:
+            audio_path = _collect_background_result(
+                "musicgen_future",
+                "Rendering with Audiocraft in the background — keep working, the preview appears here when it is ready.",
+            )
+        except AudiocraftUnavailable as exc:
+            st.warning(str(exc))
+        else:
+            if audio_path is not None:
                 st.session_state.musicgen_path = audio_path
                 st.success("MusicGen render ready for audition.")
-            except AudiocraftUnavailable as exc:
-                st.warning(str(exc))
 
         musicgen_path = st.session_state.musicgen_path
         if musicgen_path:
-            st.audio(str(musicgen_path))
             try:
-                with open(musicgen_path, "rb") as handle:
-                    musicgen_bytes = handle.read()
+                musicgen_bytes = _rendered_file_bytes(Path(musicgen_path))
+            except FileNotFoundError:
+                st.info("Generated preview not found on disk – rerun to regenerate.")
+            else:
+                st.audio(musicgen_bytes, format="audio/wav")
                 st.download_button(
                     "Download MusicGen WAV",
                     data=musicgen_bytes,
@@ -2420,8 +2969,6 @@ def _generator_tab(settings: SessionSettings) -> None:
                     mime="audio/wav",
                     key="download-musicgen-wav",
                 )
-            except FileNotFoundError:
-                st.info("Generated preview not found on disk – rerun to regenerate.")
 
     st.divider()
     st.markdown("### Blend MusicGen with MIDI")
@@ -2433,29 +2980,40 @@ def _generator_tab(settings: SessionSettings) -> None:
         )
         submitted = st.form_submit_button("Create hybrid render")
         if submitted:
-            try:
-                with st.spinner("Sculpting hybrid stem..."):
-                    blended = generate_musicgen_backing(
-                        prompt=blend_prompt,
-                        key=selected_key,
-                        scale=selected_scale,
-                        tempo=selected_tempo,
-                        instruments=selected_instruments,
-                        model=_active_musicgen_model(),
-                    )
-                st.audio(str(blended))
-                with open(blended, "rb") as handle:
-                    blend_bytes = handle.read()
-                st.download_button(
-                    "Download blend",
-                    data=blend_bytes,
-                    file_name="musicgen_blend.wav",
-                    mime="audio/wav",
-                )
-            except AudiocraftUnavailable as exc:
-                st.warning(str(exc))
+            model = _active_musicgen_model()
+            st.session_state.musicgen_blend_future = _musicgen_jobs().submit(
+                ("blend", blend_prompt, selected_key, selected_scale, selected_tempo, selected_instruments, model),
+                musicgen_backing_wav_bytes,
+                prompt=blend_prompt,
+                key=selected_key,
+                scale=selected_scale,
+                tempo=selected_tempo,
+                instruments=selected_instruments,
+                model=model,
+            )
+
+    try:
+        blend_bytes = _collect_background_result(
+            "musicgen_blend_future",
+            "Sculpting the hybrid stem in the background — it appears here when it is ready.",
+        )
+    except AudiocraftUnavailable as exc:
+        st.warning(str(exc))
+    else:
+        if blend_bytes is not None:
+            st.session_state.musicgen_blend_audio = blend_bytes
+
+    blend_audio = st.session_state.musicgen_blend_audio
+    if blend_audio:
+        st.audio(blend_audio, format="audio/wav")
+        st.download_button(
+            "Download blend",
+            data=blend_audio,
+            file_name="musicgen_blend.wav",
+            mime="audio/wav",
+        )
 
-    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(_DIV_CLOSE, unsafe_allow_html=True)
 
 
 def main() -> None:
@@ -2489,12 +3047,7 @@ def main() -> None:
     with timeline_tab:
         _timeline_tab(settings)
 
-    footer = """
-    <div style=\"margin-top: 2.5rem; text-align: center; color: #94a3b8;\">
-        Open source ❤️ • Share your creations with #LofiSymphony
-    </div>
-    """
-    st.markdown(footer, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 
 if __name__ == "__main__":  # pragma: no cover
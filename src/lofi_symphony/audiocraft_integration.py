@@ -6,11 +6,13 @@ import functools
 import importlib
 import os
 import tempfile
+import threading
+import weakref
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Protocol, TYPE_CHECKING
+from typing import Iterable, Protocol, Sequence, TYPE_CHECKING
 
-from .generator import generate_lofi_midi, midi_to_audio
+from .generator import audio_to_wav_bytes, generate_lofi_score, midi_to_audio_from_pm, overlay_pcm
 
 if TYPE_CHECKING:  # pragma: no cover - type checking only
     import torch
@@ -32,7 +34,7 @@ class _MusicGen(Protocol):
     ) -> None:
         ...
 
-    def generate_audio(self, descriptions: list[str]) -> Iterable["torch.Tensor"]:  # pragma: no cover - heavy
+    def generate_audio(self, descriptions: list[str]) -> "torch.Tensor":  # pragma: no cover - heavy
         ...
 
 
@@ -41,7 +43,11 @@ DEFAULT_MUSICGEN_MODEL = "facebook/musicgen-small"
 
 @dataclass
 class AudiocraftSettings:
-    """Configuration for a MusicGen generation request."""
+    """Configuration for a MusicGen generation request.
+
+    ``dtype`` selects the GPU compute precision (``"float16"`` or
+    ``"bfloat16"``); it is ignored when MusicGen runs on the CPU.
+    """
 
     model: str = DEFAULT_MUSICGEN_MODEL
     prompt: str = "A warm lofi beat with dusty textures"
@@ -50,30 +56,104 @@ class AudiocraftSettings:
     top_p: float = 0.0
     temperature: float = 1.0
     cfg_coef: float = 3.5
+    dtype: str = "float16"
+
+
+_MUSICGEN_DTYPES = ("float16", "bfloat16")
+_DEFAULT_GENERATION_PARAMS = (12.0, 250, 0.0, 1.0, 3.5)
+
+# Generation parameters last applied to each loaded model instance, so repeated
+# renders with unchanged settings skip ``set_generation_params``. Keyed on the
+# model itself: a reloaded model starts from MusicGen's own defaults again.
+_applied_generation_params: weakref.WeakKeyDictionary[_MusicGen, tuple[float, int, float, float, float]] = (
+    weakref.WeakKeyDictionary()
+)
+# Renders run on a worker pool; configuring a shared model and generating with
+# it must not interleave with another request's settings.
+_MUSICGEN_LOCK = threading.RLock()
+# GPU precision last applied to each loaded model instance; MusicGen itself
+# loads its language model in float16 on CUDA.
+_applied_precision: weakref.WeakKeyDictionary[_MusicGen, str] = weakref.WeakKeyDictionary()
+
+
+def _musicgen_device() -> str:
+    try:
+        torch = importlib.import_module("torch")
+    except ModuleNotFoundError:  # pragma: no cover - optional dependency
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+# Serialises loads so the download worker and a render asking for the same
+# checkpoint share one fetch instead of both missing the cache.
+_LOAD_LOCK = threading.Lock()
 
 
-@functools.lru_cache(maxsize=1)
 def _load_musicgen(model_name: str) -> _MusicGen:
+    with _LOAD_LOCK:
+        return _cached_musicgen_model(model_name)
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_musicgen_model(model_name: str) -> _MusicGen:
     try:
         models = importlib.import_module("audiocraft.models.musicgen")
     except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
         raise AudiocraftUnavailable("Audiocraft is not installed. Install `audiocraft` to enable this feature.") from exc
 
-    model = models.MusicGen.get_pretrained(model_name, progress=True)
-    model.set_generation_params(
-        duration=12.0,
-        top_k=250,
-        top_p=0.0,
-        temperature=1.0,
-        cfg_coef=3.5,
-    )
+    # Load straight onto the GPU when there is one; MusicGen autocasts to
+    # float16 there and the weights stay resident between renders.
+    model = models.MusicGen.get_pretrained(model_name, progress=True, device=_musicgen_device())
+    _apply_generation_params(model, _DEFAULT_GENERATION_PARAMS)
     return model
 
 
+def _apply_generation_params(model: _MusicGen, params: tuple[float, int, float, float, float]) -> None:
+    with _MUSICGEN_LOCK:
+        if _applied_generation_params.get(model) == params:
+            return
+        duration, top_k, top_p, temperature, cfg_coef = params
+        model.set_generation_params(
+            duration=duration,
+            top_k=top_k,
+            top_p=top_p,
+            temperature=temperature,
+            cfg_coef=cfg_coef,
+        )
+        _applied_generation_params[model] = params
+
+
+def _apply_precision(model: _MusicGen, dtype: str, torch: object) -> None:
+    """Run the language model and its autocast in ``dtype`` on CUDA devices.
+
+    Token decoding is memory-bound, so the half-width formats roughly double
+    throughput; bfloat16 falls back to float16 on GPUs without support.
+    """
+
+    if dtype not in _MUSICGEN_DTYPES:
+        raise ValueError(f"Unsupported MusicGen dtype {dtype!r}; expected one of {', '.join(_MUSICGEN_DTYPES)}.")
+    device = getattr(model, "device", None)
+    if getattr(device, "type", "cpu") != "cuda":
+        return
+    if dtype == "bfloat16" and not torch.cuda.is_bf16_supported():
+        dtype = "float16"
+
+    with _MUSICGEN_LOCK:
+        if _applied_precision.get(model, "float16") == dtype:
+            return
+        autocast = importlib.import_module("audiocraft.utils.autocast")
+        torch_dtype = getattr(torch, dtype)
+        model.lm.to(dtype=torch_dtype)
+        model.autocast = autocast.TorchAutocast(enabled=True, device_type="cuda", dtype=torch_dtype)
+        _applied_precision[model] = dtype
+
+
 def clear_cached_musicgen() -> None:
     """Reset the cached MusicGen loader so future calls reinitialise the model."""
 
-    _load_musicgen.cache_clear()
+    _cached_musicgen_model.cache_clear()
+    _applied_generation_params.clear()
+    _applied_precision.clear()
 
 
 def ensure_musicgen_assets(model_name: str = DEFAULT_MUSICGEN_MODEL) -> None:
@@ -86,18 +166,73 @@ def ensure_musicgen_assets(model_name: str = DEFAULT_MUSICGEN_MODEL) -> None:
     _load_musicgen(model_name)
 
 
-def render_musicgen(settings: AudiocraftSettings) -> Path:
-    """Generate an audio preview from a textual prompt using MusicGen."""
-
-    model = _load_musicgen(settings.model)
-    model.set_generation_params(
-        duration=settings.duration,
-        top_k=settings.top_k,
-        top_p=settings.top_p,
-        temperature=settings.temperature,
-        cfg_coef=settings.cfg_coef,
+def _generation_params(settings: AudiocraftSettings) -> tuple[str, str, float, int, float, float, float]:
+    return (
+        settings.model,
+        settings.dtype,
+        settings.duration,
+        settings.top_k,
+        settings.top_p,
+        settings.temperature,
+        settings.cfg_coef,
     )
-    tensor_audio = next(iter(model.generate_audio([settings.prompt])))
+
+
+def _copy_to_host(audio_batch: "torch.Tensor", torch: object) -> "torch.Tensor":
+    """Move a generated ``[batch, channels, samples]`` tensor to host memory.
+
+    GPU results land in a pinned buffer through one non-blocking copy for the
+    whole batch, rather than a blocking ``.cpu()`` per prompt.
+    """
+
+    if audio_batch.device.type != "cuda":
+        return audio_batch.cpu()
+    host = torch.empty(audio_batch.shape, dtype=audio_batch.dtype, pin_memory=True)
+    host.copy_(audio_batch, non_blocking=True)
+    torch.cuda.current_stream().synchronize()
+    return host
+
+
+def _generate_musicgen(settings_list: Sequence[AudiocraftSettings]) -> list[tuple["torch.Tensor", int]]:
+    """Return ``(audio, sample_rate)`` per request, batching prompts that share parameters."""
+
+    groups: dict[tuple[str, str, float, int, float, float, float], list[int]] = {}
+    for index, settings in enumerate(settings_list):
+        groups.setdefault(_generation_params(settings), []).append(index)
+    if not groups:
+        return []
+
+    try:
+        torch = importlib.import_module("torch")
+    except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
+        raise AudiocraftUnavailable("PyTorch is required to run MusicGen. Install `torch`.") from exc
+
+    results: dict[int, tuple["torch.Tensor", int]] = {}
+    for (model_name, dtype, duration, top_k, top_p, temperature, cfg_coef), indices in groups.items():
+        model = _load_musicgen(model_name)
+        prompts = [settings_list[index].prompt for index in indices]
+        with _MUSICGEN_LOCK:
+            _apply_precision(model, dtype, torch)
+            _apply_generation_params(model, (duration, top_k, top_p, temperature, cfg_coef))
+            # Inference mode drops autograd version tracking from every op of the
+            # token-by-token decode, trimming per-kernel dispatch overhead.
+            with torch.inference_mode():
+                audio_batch = _copy_to_host(model.generate_audio(prompts), torch)
+        for index, tensor_audio in zip(indices, audio_batch):
+            results[index] = (tensor_audio, model.sample_rate)
+    return [results[index] for index in range(len(settings_list))]
+
+
+def render_musicgen_batch(settings_list: Sequence[AudiocraftSettings]) -> list[Path]:
+    """Generate one audio preview per request, batching prompts that share parameters.
+
+    Requests with the same model and generation parameters are decoded in a
+    single ``generate_audio`` call. Paths are returned in input order.
+    """
+
+    rendered = _generate_musicgen(settings_list)
+    if not rendered:
+        return []
 
     try:
         torchaudio = importlib.import_module("torchaudio")
@@ -106,14 +241,23 @@ def render_musicgen(settings: AudiocraftSettings) -> Path:
             "Torchaudio is required to export MusicGen results. Install `torchaudio`."
         ) from exc
 
-    fd, temp_path = tempfile.mkstemp(suffix=".wav")
-    os.close(fd)
-    out_path = Path(temp_path)
-    torchaudio.save(out_path, tensor_audio.cpu(), sample_rate=model.sample_rate)
-    return out_path
+    out_paths: list[Path] = []
+    for tensor_audio, sample_rate in rendered:
+        fd, temp_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        out_path = Path(temp_path)
+        torchaudio.save(out_path, tensor_audio, sample_rate=sample_rate)
+        out_paths.append(out_path)
+    return out_paths
 
 
-def generate_musicgen_backing(
+def render_musicgen(settings: AudiocraftSettings) -> Path:
+    """Generate an audio preview from a textual prompt using MusicGen."""
+
+    return render_musicgen_batch([settings])[0]
+
+
+def musicgen_backing_wav_bytes(
     *,
     prompt: str,
     key: str,
@@ -121,30 +265,52 @@ def generate_musicgen_backing(
     tempo: int,
     instruments: Iterable[str],
     model: str | None = None,
-) -> Path:
-    """Produce a hybrid track that blends MIDI scaffolding with MusicGen."""
+) -> bytes:
+    """Blend MIDI scaffolding with MusicGen and return the mix as WAV bytes.
+
+    Nothing touches the filesystem, so concurrent blends cannot clobber each
+    other's output.
+    """
 
-    midi_bytes = generate_lofi_midi(key=key, scale=scale, tempo=tempo, instruments=instruments)
-    midi_audio = midi_to_audio(midi_bytes, add_vinyl_fx=False)
-    fd, temp_path = tempfile.mkstemp(suffix=".wav")
-    os.close(fd)
-    midi_path = Path(temp_path)
-    midi_audio.export(midi_path, format="wav")
+    score = generate_lofi_score(key=key, scale=scale, tempo=tempo, instruments=instruments)
+    midi_seg = midi_to_audio_from_pm(score, add_vinyl_fx=False)
 
     settings = AudiocraftSettings(model=model or DEFAULT_MUSICGEN_MODEL, prompt=prompt)
-    musicgen_path = render_musicgen(settings)
+    ((tensor_audio, sample_rate),) = _generate_musicgen([settings])
 
     try:
         audiosegment = importlib.import_module("pydub").AudioSegment
     except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
         raise AudiocraftUnavailable("pydub is required to fuse MusicGen and MIDI renders.") from exc
 
-    midi_seg = audiosegment.from_wav(midi_path)
-    mg_seg = audiosegment.from_wav(musicgen_path)
-    blended = midi_seg.overlay(mg_seg - 6)
-    output_path = Path.cwd() / "lofi_musicgen_blend.wav"
-    blended.export(output_path, format="wav")
+    # Both layers stay in memory: the MusicGen tensor becomes 16-bit PCM
+    # directly instead of going through a temporary WAV file.
+    channels = tensor_audio.shape[0] if tensor_audio.dim() > 1 else 1
+    pcm = (tensor_audio.clamp(-1.0, 1.0).numpy().T * 32767).astype("<i2")
+    mg_seg = audiosegment(pcm.tobytes(), frame_rate=sample_rate, sample_width=2, channels=channels)
+    return audio_to_wav_bytes(overlay_pcm(midi_seg, mg_seg, layer_gain_db=-6.0))
+
+
+def generate_musicgen_backing(
+    *,
+    prompt: str,
+    key: str,
+    scale: str,
+    tempo: int,
+    instruments: Iterable[str],
+    model: str | None = None,
+) -> Path:
+    """Produce a hybrid track that blends MIDI scaffolding with MusicGen."""
 
-    midi_path.unlink(missing_ok=True)
-    musicgen_path.unlink(missing_ok=True)
+    output_path = Path.cwd() / "lofi_musicgen_blend.wav"
+    output_path.write_bytes(
+        musicgen_backing_wav_bytes(
+            prompt=prompt,
+            key=key,
+            scale=scale,
+            tempo=tempo,
+            instruments=instruments,
+            model=model,
+        )
+    )
     return output_path
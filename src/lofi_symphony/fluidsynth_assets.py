@@ -24,6 +24,7 @@ __all__ = [
     "iter_bundled_candidates",
     "iter_bundled_soundfonts",
     "resolve_soundfont_path",
+    "clear_asset_caches",
     "SoundfontSource",
     "recommended_soundfonts",
     "download_soundfont",
@@ -109,13 +110,34 @@ def recommended_soundfonts() -> tuple[SoundfontSource, ...]:
     return _RECOMMENDED_SOUNDFONTS
 
 
+def _scan_files(directory: Path, suffixes: tuple[str, ...]) -> list[Path]:
+    """List regular files in ``directory`` ending in ``suffixes``, sorted by name.
+
+    ``os.scandir`` hands back the file type with each entry, so this costs one
+    directory read instead of a glob plus an ``is_file`` stat per match.
+    """
+
+    try:
+        with os.scandir(directory) as entries:
+            names = [entry.name for entry in entries if entry.name.endswith(suffixes) and entry.is_file()]
+    except OSError:
+        return []
+    return [directory / name for name in sorted(names)]
+
+
 def _iter_user_soundfonts() -> Iterator[Path]:
-    directory = _USER_SOUNDFONT_DIR
-    if not directory.exists():
-        return
-    for path in sorted(directory.glob("*.sf[23]")):
-        if path.is_file():
-            yield path
+    yield from _scan_files(_USER_SOUNDFONT_DIR, (".sf2", ".sf3"))
+
+
+_DOWNLOAD_CHUNK_BYTES = 1 << 20
+
+
+def _sha256_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_DOWNLOAD_CHUNK_BYTES), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
 
 
 def download_soundfont(
@@ -131,11 +153,13 @@ def download_soundfont(
     target_path = dest_dir / source.filename
 
     if target_path.exists():
-        if hashlib.sha256(target_path.read_bytes()).hexdigest() == source.sha256:
+        if _sha256_file(target_path) == source.sha256:
             return target_path
         target_path.unlink()
 
-    with tempfile.NamedTemporaryFile(suffix=Path(source.filename).suffix, delete=False) as tmp_file:
+    # Stage the download beside the target so installing it is a same-filesystem
+    # rename; the ``.part`` suffix keeps soundfont discovery from listing it.
+    with tempfile.NamedTemporaryFile(suffix=".part", dir=dest_dir, delete=False) as tmp_file:
         tmp_path = Path(tmp_file.name)
 
     try:
@@ -148,28 +172,31 @@ def download_soundfont(
             content_length = response.headers.get("Content-Length")
             total_bytes = int(content_length) if content_length else 0
             read_bytes = 0
+            # Hash while streaming so the file is never read back from disk.
+            hasher = hashlib.sha256()
             while True:
-                chunk = response.read(8192)
+                chunk = response.read(_DOWNLOAD_CHUNK_BYTES)
                 if not chunk:
                     break
                 downloaded.write(chunk)
+                hasher.update(chunk)
                 read_bytes += len(chunk)
                 if progress_hook:
                     progress_hook(read_bytes, total_bytes)
 
-        actual_sha256 = hashlib.sha256(tmp_path.read_bytes()).hexdigest()
+        actual_sha256 = hasher.hexdigest()
         if actual_sha256 != source.sha256:
             raise RuntimeError(
                 f"Checksum mismatch for {source.name}: expected {source.sha256}, got {actual_sha256}"
             )
 
-        shutil.move(str(tmp_path), target_path)
+        os.replace(tmp_path, target_path)
+        clear_asset_caches()
         if progress_hook:
             progress_hook(read_bytes, read_bytes)
         return target_path
     finally:
-        if tmp_path.exists():
-            tmp_path.unlink()
+        tmp_path.unlink(missing_ok=True)
 def iter_bundled_candidates() -> Iterator[Path]:
     """Yield possible FluidSynth executables bundled with the package."""
 
@@ -192,9 +219,35 @@ def _iter_configured_locations() -> Iterable[Path]:
     yield from iter_bundled_candidates()
 
 
+# Only successful lookups are remembered, keyed by the override in effect: a
+# miss rescans on the next call so a freshly installed binary or soundfont is
+# picked up without restarting.
+_FLUIDSYNTH_HITS: dict[str | None, str] = {}
+_SOUNDFONT_HITS: dict[tuple[str | None, str | None], str] = {}
+
+
 def resolve_fluidsynth_executable() -> str | None:
-    """Return the path to a FluidSynth executable if one is available."""
+    """Return the path to a FluidSynth executable if one is available.
+
+    Found paths are cached per ``LOFI_SYMPHONY_FLUIDSYNTH`` value; a cached
+    path that has since disappeared, or no cached path at all, triggers a
+    fresh scan.
+    """
 
+    env_override = os.getenv(FLUIDSYNTH_ENV_VAR)
+    located = _FLUIDSYNTH_HITS.get(env_override)
+    if located is not None and os.path.exists(located):
+        return located
+
+    located = _scan_fluidsynth_executable()
+    if located is None:
+        _FLUIDSYNTH_HITS.pop(env_override, None)
+    else:
+        _FLUIDSYNTH_HITS[env_override] = located
+    return located
+
+
+def _scan_fluidsynth_executable() -> str | None:
     for candidate in _iter_configured_locations():
         if candidate.is_file():
             return str(candidate)
@@ -209,9 +262,7 @@ def resolve_fluidsynth_executable() -> str | None:
 def iter_bundled_soundfonts() -> Iterator[Path]:
     """Yield bundled General MIDI soundfonts."""
 
-    for path in _soundfont_vendor_root().glob("*.sf2"):
-        if path.is_file():
-            yield path
+    yield from _scan_files(_soundfont_vendor_root(), (".sf2",))
 
 
 def _iter_soundfont_candidates(user_provided: str | None = None) -> Iterator[Path]:
@@ -250,9 +301,35 @@ def _iter_soundfont_candidates(user_provided: str | None = None) -> Iterator[Pat
 
 
 def resolve_soundfont_path(preferred: str | None = None) -> str | None:
-    """Return the path to an available soundfont, if any."""
+    """Return the path to an available soundfont, if any.
+
+    Found paths are cached per ``(preferred, LOFI_SYMPHONY_SOUNDFONT)`` pair,
+    so repeated renders skip the directory scans; a cached path that has
+    since disappeared, or no cached path at all, triggers a fresh scan.
+    """
+
+    cache_key = (preferred, os.getenv(SOUNDFONT_ENV_VAR))
+    located = _SOUNDFONT_HITS.get(cache_key)
+    if located is not None and os.path.exists(located):
+        return located
+
+    located = _scan_soundfont_path(preferred)
+    if located is None:
+        _SOUNDFONT_HITS.pop(cache_key, None)
+    else:
+        _SOUNDFONT_HITS[cache_key] = located
+    return located
+
 
+def _scan_soundfont_path(preferred: str | None) -> str | None:
     for candidate in _iter_soundfont_candidates(preferred):
         if candidate.is_file():
             return str(candidate)
     return None
+
+
+def clear_asset_caches() -> None:
+    """Forget cached FluidSynth and soundfont lookups so the next call rescans."""
+
+    _FLUIDSYNTH_HITS.clear()
+    _SOUNDFONT_HITS.clear()
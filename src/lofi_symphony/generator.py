@@ -2,21 +2,24 @@
 
 from __future__ import annotations
 
+import functools
+import importlib
+import importlib.util
+import inspect
 import io
+import itertools
 import os
 import random
+import re
+import struct
 import subprocess
 import tempfile
+import threading
 import warnings
 from dataclasses import dataclass
-from typing import Iterable, List, Mapping, Sequence
+from typing import TYPE_CHECKING, Iterable, List, Mapping, Sequence
 
 import numpy as np
-import pretty_midi
-from music21 import chord, key as m21key, pitch as m21pitch
-from pydub import AudioSegment
-from pydub.exceptions import CouldntDecodeError
-from pydub.generators import WhiteNoise
 
 from .fluidsynth_assets import (
     SOUNDFONT_ENV_VAR,
@@ -24,10 +27,20 @@ from .fluidsynth_assets import (
     resolve_soundfont_path,
 )
 
+if TYPE_CHECKING:  # pragma: no cover - type checking only
+    import pretty_midi
+    from music21 import key as m21key, pitch as m21pitch
+    from pydub import AudioSegment
+
 __all__ = [
     "generate_lofi_midi",
+    "generate_lofi_score",
     "generate_structured_song",
     "midi_to_audio",
+    "midi_to_audio_from_pm",
+    "in_process_rendering_available",
+    "audio_to_wav_bytes",
+    "overlay_pcm",
     "TYPE_PROGRESSIONS",
     "TYPE_INSTRUMENTS",
     "MOOD_TEMPO",
@@ -118,9 +131,23 @@ def _dedupe_instruments(instruments: Sequence[str]) -> List[str]:
     return filtered
 
 
-def _scale_note_names(musical_key: m21key.Key) -> List[str]:
-    names = [_pitch_to_pretty_name(p).rstrip("0123456789") for p in musical_key.getPitches()]
-    return names or ["C", "E", "G", "Bb"]
+@functools.lru_cache(maxsize=64)
+def _music_key(key: str, scale: str) -> m21key.Key:
+    """Return a shared :class:`music21.key.Key`; callers only read from it."""
+
+    from music21 import key as m21key
+
+    return m21key.Key(key, scale)
+
+
+def _scale_note_names(musical_key: m21key.Key) -> tuple[str, ...]:
+    return _scale_note_names_for(musical_key.tonic.name, musical_key.mode)
+
+
+@functools.lru_cache(maxsize=64)
+def _scale_note_names_for(tonic: str, mode: str) -> tuple[str, ...]:
+    names = tuple(_pitch_to_pretty_name(p).rstrip("0123456789") for p in _music_key(tonic, mode).getPitches())
+    return names or ("C", "E", "G", "Bb")
 
 
 def _generate_hook_motif(musical_key: m21key.Key, *, octave: int = 5) -> List[str]:
@@ -184,7 +211,11 @@ def _build_arrangement_plan(
     ]
 
 
-def _apply_hook_layer(pm: pretty_midi.PrettyMIDI, n_bars: int, motif: Sequence[str]) -> None:
+def _apply_hook_layer(
+    pm: pretty_midi.PrettyMIDI, n_bars: int, motif: Sequence[str], *, start_time: float = 0.0
+) -> None:
+    import pretty_midi
+
     if not motif:
         return
 
@@ -193,20 +224,21 @@ def _apply_hook_layer(pm: pretty_midi.PrettyMIDI, n_bars: int, motif: Sequence[s
     bar_duration = 2.0
     step_duration = max(0.25, bar_duration / max(len(motif), 1))
 
-    for bar in range(n_bars):
-        for idx, note_name in enumerate(motif):
-            start = bar * bar_duration + idx * step_duration
-            start = max(0.0, _humanize(start, amount=0.02))
-            end = start + step_duration * 0.85
-            pitch = pretty_midi.note_name_to_number(note_name)
-            hook_instrument.notes.append(
-                pretty_midi.Note(
-                    velocity=random.randint(70, 88),
-                    pitch=pitch,
-                    start=start,
-                    end=end,
-                )
-            )
+    rng = np.random.default_rng()
+    grid = start_time + np.arange(n_bars)[:, None] * bar_duration + np.arange(len(motif))[None, :] * step_duration
+    starts = np.maximum(0.0, grid + rng.uniform(-0.02, 0.02, size=grid.shape)).ravel()
+    velocities = rng.integers(70, 89, size=starts.size)
+    pitches = [_note_number(note_name) for note_name in motif] * n_bars
+
+    hook_instrument.notes.extend(
+        map(
+            pretty_midi.Note,
+            velocities.tolist(),
+            pitches,
+            starts.tolist(),
+            (starts + step_duration * 0.85).tolist(),
+        )
+    )
 
     pm.instruments.append(hook_instrument)
 
@@ -214,66 +246,205 @@ def _apply_hook_layer(pm: pretty_midi.PrettyMIDI, n_bars: int, motif: Sequence[s
 def _pitch_to_pretty_name(pitch_obj: m21pitch.Pitch) -> str:
     """Return a pretty_midi-compatible name for a music21 pitch."""
 
+    import pretty_midi
+
     return pretty_midi.note_number_to_name(int(round(pitch_obj.midi)))
 
 
-def _get_chord_pitches(roman: str, musical_key: m21key.Key) -> List[str]:
-    chord_obj = chord.Chord(musical_key.romanNumeral(roman).pitches)
-    return [_pitch_to_pretty_name(p) for p in chord_obj.pitches]
+def _get_chord_pitches(roman: str, musical_key: m21key.Key) -> tuple[int, ...]:
+    """Return the MIDI numbers of ``roman`` in ``musical_key``."""
+
+    # music21 places the tonic in octave 4 by spelling, so Cb sits at 59 and B#
+    # at 72; shifting by the tonic's MIDI number keeps those octaves intact.
+    return _chord_numbers_for(roman, int(round(musical_key.tonic.midi)) - 60, musical_key.mode)
+
+
+@functools.lru_cache(maxsize=64)
+def _chord_voicing(roman: str, mode: str) -> tuple[int, ...]:
+    """Resolve ``roman`` with music21 in C ``mode``; every other key is a transposition."""
+
+    from music21 import chord
+
+    chord_obj = chord.Chord(_music_key("C", mode).romanNumeral(roman).pitches)
+    return tuple(int(round(p.midi)) for p in chord_obj.pitches)
+
 
+@functools.lru_cache(maxsize=256)
+def _chord_numbers_for(roman: str, tonic_offset: int, mode: str) -> tuple[int, ...]:
+    # music21 voices chords upward from the tonic, so shifting the C voicing
+    # by the tonic's distance from C4 matches resolving it in that key.
+    return tuple(number + tonic_offset for number in _chord_voicing(roman, mode))
 
-def _humanize(value: float, amount: float = 0.03) -> float:
-    return float(value) + np.random.uniform(-amount, amount)
 
+@functools.lru_cache(maxsize=256)
+def _note_number(note_name: str) -> int:
+    import pretty_midi
+
+    return pretty_midi.note_name_to_number(note_name)
+
+
+@functools.lru_cache(maxsize=64)
+def _melody_pitch_pool(scale_notes: tuple[str, ...]) -> np.ndarray:
+    """MIDI numbers for each scale degree in octaves 4 and 5, shape ``(degrees, 2)``."""
+
+    pool = np.array([[_note_number(f"{name}{octave}") for octave in (4, 5)] for name in scale_notes])
+    pool.setflags(write=False)
+    return pool
+
+
+def _jitter(rng: np.random.Generator, size: int | tuple[int, ...], amount: float = 0.03) -> np.ndarray:
+    """Draw every humanisation offset for a part in one call."""
+
+    return rng.uniform(-amount, amount, size=size)
+
+
+def _add_drum_track(pm: pretty_midi.PrettyMIDI, bar_starts: np.ndarray, rhythm: str) -> None:
+    import pretty_midi
 
-def _add_drum_track(pm: pretty_midi.PrettyMIDI, n_bars: int, rhythm: str) -> None:
     drum_inst = pretty_midi.Instrument(program=0, is_drum=True)
     swing_offset = 0.12 if rhythm == "Swing" else 0.0
 
-    for bar in range(n_bars):
-        start_beat = bar * 2
-        drum_inst.notes.append(
-            pretty_midi.Note(velocity=80, pitch=DRUM_NOTE_MAP["kick"], start=start_beat, end=start_beat + 0.12)
-        )
-        drum_inst.notes.append(
-            pretty_midi.Note(velocity=75, pitch=DRUM_NOTE_MAP["snare"], start=start_beat + 1, end=start_beat + 1.12)
-        )
+    # Lay the kit out as flat start/end/pitch/velocity arrays and only build
+    # Note objects at the end; one bar is a kick, a snare and four hats.
+    n_bars = bar_starts.size
+    steps = np.arange(4)
+    start_beats = bar_starts.astype(float)
+    hat_offsets = 0.5 * steps + swing_offset * (steps % 2)
+    hat_starts = (start_beats[:, None] + hat_offsets[None, :]).ravel()
+
+    starts = np.concatenate((start_beats, start_beats + 1, hat_starts))
+    ends = starts + np.repeat((0.12, 0.12, 0.09), (n_bars, n_bars, hat_starts.size))
+    pitches = np.repeat(
+        (DRUM_NOTE_MAP["kick"], DRUM_NOTE_MAP["snare"], DRUM_NOTE_MAP["hat_closed"]),
+        (n_bars, n_bars, hat_starts.size),
+    )
+    velocities = np.repeat((80, 75, 55), (n_bars, n_bars, hat_starts.size))
 
-        for step in range(4):
-            offset = (0.5 * step) + (swing_offset if step % 2 else 0.0)
-            drum_inst.notes.append(
-                pretty_midi.Note(
-                    velocity=55,
-                    pitch=DRUM_NOTE_MAP["hat_closed"],
-                    start=start_beat + offset,
-                    end=start_beat + offset + 0.09,
-                )
-            )
+    drum_inst.notes = list(
+        map(pretty_midi.Note, velocities.tolist(), pitches.tolist(), starts.tolist(), ends.tolist())
+    )
 
     pm.instruments.append(drum_inst)
 
 
+_NOISE_LOOP_SECONDS = 60
+
+
+@functools.lru_cache(maxsize=8)
+def _noise_loop(frame_rate: int, volume: float, high_pass: float | None, low_pass: float | None) -> np.ndarray:
+    """Return a cached, seamlessly looping band of white noise as int16 samples.
+
+    The noise is shaped in the frequency domain with the same first-order
+    responses as pydub's RC filters, so it costs one FFT per format instead of
+    a per-sample Python filter on every render.
+    """
+
+    size = frame_rate * _NOISE_LOOP_SECONDS
+    rng = np.random.default_rng()
+    noise = rng.uniform(-1.0, 1.0, size) * (32767 * 10 ** (volume / 20))
+    spectrum = np.fft.rfft(noise)
+    frequencies = np.fft.rfftfreq(size, d=1.0 / frame_rate)
+    if low_pass:
+        spectrum /= np.sqrt(1 + (frequencies / low_pass) ** 2)
+    if high_pass:
+        ratio = frequencies / high_pass
+        spectrum *= ratio / np.sqrt(1 + ratio**2)
+    return np.fft.irfft(spectrum, n=size).astype("<i2")
+
+
+def _noise_layer(
+    audio: AudioSegment,
+    *,
+    volume: float,
+    high_pass: float | None = None,
+    low_pass: float | None = None,
+) -> AudioSegment:
+    from pydub import AudioSegment
+
+    loop = _noise_loop(audio.frame_rate, volume, high_pass, low_pass)
+    frames = int(audio.frame_count())
+    samples = np.tile(loop, -(-frames // loop.size))[:frames]
+    return AudioSegment(samples.tobytes(), frame_rate=audio.frame_rate, sample_width=2, channels=1)
+
+
 def _add_fx_layer(audio: AudioSegment) -> AudioSegment:
-    noise = WhiteNoise().to_audio_segment(duration=len(audio), volume=-32)
-    vinyl = noise.low_pass_filter(3000)
-    return audio.overlay(vinyl)
+    return overlay_pcm(audio, _noise_layer(audio, volume=-32, low_pass=3000))
 
 
-def _placeholder_audio_from_midi(midi_payload: bytes) -> AudioSegment:
+def _placeholder_audio(midi_obj: pretty_midi.PrettyMIDI | None) -> AudioSegment:
     """Generate a silent audio placeholder that matches the MIDI length."""
 
+    from pydub import AudioSegment
+
     try:
-        midi_stream = io.BytesIO(midi_payload)
-        midi_stream.seek(0)
-        midi_data = pretty_midi.PrettyMIDI(midi_stream)
-        duration_ms = int(max(midi_data.get_end_time(), 0.5) * 1000)
+        duration_ms = int(max(midi_obj.get_end_time(), 0.5) * 1000) if midi_obj else 2000
     except Exception:
         duration_ms = 2000
     duration_ms = max(duration_ms, 500)
     return AudioSegment.silent(duration=duration_ms)
 
 
-def generate_lofi_midi(
+def _build_bass(
+    bar_chords: Sequence[tuple[int, ...]], bar_starts: np.ndarray, rng: np.random.Generator
+) -> pretty_midi.Instrument:
+    """Root notes of each bar's chord, two octaves down."""
+
+    import pretty_midi
+
+    inst = pretty_midi.Instrument(program=INSTRUMENT_PROGRAMS["Bass"])
+    # Jitter can pull bar 0 before zero; scores handed straight to a
+    # synthesiser never pass through MIDI's tick clamping, so clip here.
+    times = np.maximum(_jitter(rng, (len(bar_chords), 2)) + bar_starts[:, None] + (0.0, 1.6), 0.0)
+    velocities = rng.integers(55, 76, size=len(bar_chords))
+    pitches = [36 + chord_pitches[0] % 12 for chord_pitches in bar_chords]
+    inst.notes = list(map(pretty_midi.Note, velocities.tolist(), pitches, times[:, 0].tolist(), times[:, 1].tolist()))
+    return inst
+
+
+def _build_harmony(
+    program: int,
+    bar_chords: Sequence[tuple[int, ...]],
+    scale_notes: tuple[str, ...],
+    bar_starts: np.ndarray,
+    rng: np.random.Generator,
+) -> pretty_midi.Instrument:
+    """Sustained chords with a sparse melodic line drawn from the scale."""
+
+    import pretty_midi
+
+    n_bars = len(bar_chords)
+    inst = pretty_midi.Instrument(program=program)
+
+    # Chord tones: one sustained note per pitch of each bar's chord.
+    chord_sizes = [len(chord_pitches) for chord_pitches in bar_chords]
+    chord_pitches = np.fromiter(itertools.chain.from_iterable(bar_chords), dtype=int)
+    chord_times = np.maximum(
+        _jitter(rng, (chord_pitches.size, 2)) + np.repeat(bar_starts, chord_sizes)[:, None] + (0.0, 1.8), 0.0
+    )
+    chord_velocities = rng.integers(60, 86, size=chord_pitches.size)
+
+    # Melody: each eighth-note slot plays a random scale tone in octave 4 or 5
+    # seven times out of ten.
+    scale_pool = _melody_pitch_pool(scale_notes)
+    beat_offsets = bar_starts[:, None] + np.arange(4) * 0.5
+    melody_starts = np.maximum(beat_offsets + _jitter(rng, (n_bars, 4)), 0.0)
+    melody_ends = beat_offsets + 0.4 + _jitter(rng, (n_bars, 4))
+    melody_plays = rng.random((n_bars, 4)) < 0.7
+    melody_pitches = scale_pool[rng.integers(len(scale_notes), size=(n_bars, 4)), rng.integers(2, size=(n_bars, 4))]
+    melody_velocities = rng.integers(50, 76, size=(n_bars, 4))
+
+    # Both layers go through a single Note-construction pass.
+    velocities = np.concatenate((chord_velocities, melody_velocities[melody_plays]))
+    pitches = np.concatenate((chord_pitches, melody_pitches[melody_plays]))
+    starts = np.concatenate((chord_times[:, 0], melody_starts[melody_plays]))
+    ends = np.concatenate((chord_times[:, 1], melody_ends[melody_plays]))
+    inst.notes = list(
+        map(pretty_midi.Note, velocities.tolist(), pitches.tolist(), starts.tolist(), ends.tolist())
+    )
+    return inst
+
+
+def generate_lofi_score(
     *,
     key: str = "C",
     scale: str = "minor",
@@ -284,75 +455,106 @@ def generate_lofi_midi(
     instruments: Sequence[str] | None = None,
     n_bars: int = 8,
     progression: Sequence[str] | None = None,
-) -> io.BytesIO:
-    """Generate a LoFi MIDI track and return the raw bytes."""
+    start_bar: int = 0,
+) -> pretty_midi.PrettyMIDI:
+    """Generate a LoFi arrangement as an in-memory :class:`pretty_midi.PrettyMIDI` score.
+
+    Notes begin ``start_bar`` bars in, so sections of a longer song are laid
+    out in place rather than shifted afterwards.
+    """
+
+    import pretty_midi
 
     pm = pretty_midi.PrettyMIDI(initial_tempo=tempo)
-    key_obj = m21key.Key(key, scale)
+    key_obj = _music_key(key, scale)
     if progression is None:
         progression_sequence = random.choice(TYPE_PROGRESSIONS.get(lofi_type, TYPE_PROGRESSIONS["Chillhop"]))
     else:
         progression_sequence = list(progression)
 
     selected_instruments: Iterable[str] = instruments or AVAILABLE_INSTRUMENTS
+    rng = np.random.default_rng()
+    bar_starts = (start_bar + np.arange(n_bars)) * 2.0
+    bar_chords = [
+        _get_chord_pitches(progression_sequence[bar % len(progression_sequence)], key_obj) for bar in range(n_bars)
+    ]
+    scale_notes = _scale_note_names(key_obj)
 
     for instrument_name in selected_instruments:
         if instrument_name == "Bass":
-            inst = pretty_midi.Instrument(program=INSTRUMENT_PROGRAMS["Bass"])
-            for bar in range(n_bars):
-                chord_roman = progression_sequence[bar % len(progression_sequence)]
-                root_note = _get_chord_pitches(chord_roman, key_obj)[0]
-                root_name = root_note.rstrip("0123456789")
-                note = pretty_midi.Note(
-                    velocity=random.randint(55, 75),
-                    pitch=pretty_midi.note_name_to_number(f"{root_name}2"),
-                    start=bar * 2 + _humanize(0),
-                    end=bar * 2 + _humanize(1.6),
-                )
-                inst.notes.append(note)
-            pm.instruments.append(inst)
-            continue
+            pm.instruments.append(_build_bass(bar_chords, bar_starts, rng))
+        elif instrument_name in INSTRUMENT_PROGRAMS:
+            pm.instruments.append(
+                _build_harmony(INSTRUMENT_PROGRAMS[instrument_name], bar_chords, scale_notes, bar_starts, rng)
+            )
+        elif instrument_name == "Drums":
+            _add_drum_track(pm, bar_starts, rhythm=rhythm)
 
-        if instrument_name in INSTRUMENT_PROGRAMS:
-            inst = pretty_midi.Instrument(program=INSTRUMENT_PROGRAMS[instrument_name])
-            scale_notes = [
-                _pitch_to_pretty_name(p).rstrip("0123456789") for p in key_obj.getPitches()
-            ]
-            for bar in range(n_bars):
-                chord_roman = progression_sequence[bar % len(progression_sequence)]
-                chord_pitches = _get_chord_pitches(chord_roman, key_obj)
-                for pitch_name in chord_pitches:
-                    note = pretty_midi.Note(
-                        velocity=random.randint(60, 85),
-                        pitch=pretty_midi.note_name_to_number(pitch_name),
-                        start=bar * 2 + _humanize(0),
-                        end=bar * 2 + _humanize(1.8),
-                    )
-                    inst.notes.append(note)
-
-                for beat in range(4):
-                    if random.random() < 0.7:
-                        pitch_choice = random.choice(scale_notes)
-                        octave = random.choice([4, 5])
-                        note = pretty_midi.Note(
-                            velocity=random.randint(50, 75),
-                            pitch=pretty_midi.note_name_to_number(f"{pitch_choice}{octave}"),
-                            start=bar * 2 + _humanize(beat * 0.5),
-                            end=bar * 2 + _humanize(beat * 0.5 + 0.4),
-                        )
-                        inst.notes.append(note)
-            pm.instruments.append(inst)
-            continue
+    return pm
 
-        if instrument_name == "Drums":
-            _add_drum_track(pm, n_bars=n_bars, rhythm=rhythm)
 
+def generate_lofi_midi(
+    *,
+    key: str = "C",
+    scale: str = "minor",
+    tempo: int = 72,
+    lofi_type: str = "Chillhop",
+    rhythm: str = "Straight",
+    mood: str = "Chill",
+    instruments: Sequence[str] | None = None,
+    n_bars: int = 8,
+    progression: Sequence[str] | None = None,
+) -> io.BytesIO:
+    """Generate a LoFi MIDI track and return the raw bytes."""
+
+    pm = generate_lofi_score(
+        key=key,
+        scale=scale,
+        tempo=tempo,
+        lofi_type=lofi_type,
+        rhythm=rhythm,
+        mood=mood,
+        instruments=instruments,
+        n_bars=n_bars,
+        progression=progression,
+    )
     midi_bytes = io.BytesIO()
     pm.write(midi_bytes)
     midi_bytes.seek(0)
     return midi_bytes
 
 
+def _render_section(
+    section: _SectionBlueprint,
+    start_bar: int,
+    *,
+    hook_motif: Sequence[str],
+    song_kwargs: Mapping[str, object],
+) -> tuple[List[pretty_midi.Instrument], SectionArrangement]:
+    """Render one arrangement section, shifted to ``start_bar``, without touching shared state."""
+
+    section_pm = generate_lofi_score(
+        **song_kwargs,
+        instruments=section.instruments,
+        n_bars=section.n_bars,
+        progression=section.progression,
+        start_bar=start_bar,
+    )
+    if section.has_hook:
+        _apply_hook_layer(section_pm, section.n_bars, hook_motif, start_time=start_bar * 2.0)
+
+    arrangement = SectionArrangement(
+        name=section.name,
+        start_bar=start_bar,
+        n_bars=section.n_bars,
+        progression=section.progression,
+        instruments=section.instruments,
+        has_hook=section.has_hook,
+        hook_motif=hook_motif if section.has_hook else [],
+    )
+    return section_pm.instruments, arrangement
+
+
 def generate_structured_song(
     *,
     key: str = "C",
@@ -363,57 +565,41 @@ def generate_structured_song(
     mood: str = "Chill",
     instruments: Sequence[str] | None = None,
 ) -> tuple[io.BytesIO, List[SectionArrangement]]:
-    """Generate a multi-section arrangement with an optional hook motif."""
+    """Generate a multi-section arrangement with an optional hook motif.
+
+    Sections are built one after another: each takes well under a millisecond
+    now that parts are vectorised, so a worker pool only adds overhead.
+    """
+
+    import pretty_midi
 
     progression_pool = TYPE_PROGRESSIONS.get(lofi_type, TYPE_PROGRESSIONS["Chillhop"])
     base_instruments = instruments or TYPE_INSTRUMENTS.get(lofi_type, AVAILABLE_INSTRUMENTS)
-    key_obj = m21key.Key(key, scale)
+    key_obj = _music_key(key, scale)
     plan = _build_arrangement_plan(
         lofi_type=lofi_type,
         base_instruments=base_instruments,
         progression_pool=progression_pool,
     )
     hook_motif = _generate_hook_motif(key_obj)
+    song_kwargs = {
+        "key": key,
+        "scale": scale,
+        "tempo": tempo,
+        "lofi_type": lofi_type,
+        "rhythm": rhythm,
+        "mood": mood,
+    }
+
+    start_bars = list(itertools.accumulate((section.n_bars for section in plan[:-1]), initial=0))
     master_midi = pretty_midi.PrettyMIDI(initial_tempo=tempo)
     sections: List[SectionArrangement] = []
-    bar_duration = 2.0
-    current_bar = 0
-
-    for section in plan:
-        section_midi_bytes = generate_lofi_midi(
-            key=key,
-            scale=scale,
-            tempo=tempo,
-            lofi_type=lofi_type,
-            rhythm=rhythm,
-            mood=mood,
-            instruments=section.instruments,
-            n_bars=section.n_bars,
-            progression=section.progression,
-        )
-        section_pm = pretty_midi.PrettyMIDI(io.BytesIO(section_midi_bytes.getvalue()))
-        if section.has_hook:
-            _apply_hook_layer(section_pm, section.n_bars, hook_motif)
-
-        for instrument in section_pm.instruments:
-            for note in instrument.notes:
-                note.start += current_bar * bar_duration
-                note.end += current_bar * bar_duration
-        master_midi.instruments.extend(section_pm.instruments)
-
-        sections.append(
-            SectionArrangement(
-                name=section.name,
-                start_bar=current_bar,
-                n_bars=section.n_bars,
-                progression=section.progression,
-                instruments=section.instruments,
-                has_hook=section.has_hook,
-                hook_motif=hook_motif if section.has_hook else [],
-            )
+    for section, start_bar in zip(plan, start_bars):
+        section_instruments, arrangement = _render_section(
+            section, start_bar, hook_motif=hook_motif, song_kwargs=song_kwargs
         )
-
-        current_bar += section.n_bars
+        master_midi.instruments.extend(section_instruments)
+        sections.append(arrangement)
 
     midi_bytes = io.BytesIO()
     master_midi.write(midi_bytes)
@@ -422,16 +608,63 @@ def generate_structured_song(
 
 
 def midi_to_audio(
-    midi_bytes: io.BytesIO,
+    midi_bytes: io.BytesIO | bytes,
     *,
     soundfont: str | None = None,
     add_vinyl_fx: bool = False,
     instrument_effects: Mapping[str, Sequence[str]] | None = None,
 ) -> AudioSegment:
-    """Render a MIDI byte stream to audio using FluidSynth when available."""
+    """Render a MIDI byte stream or raw MIDI payload to audio using FluidSynth when available."""
 
-    midi_bytes.seek(0)
-    midi_payload = midi_bytes.getvalue()
+    import pretty_midi
+
+    if isinstance(midi_bytes, bytes):
+        midi_payload = midi_bytes
+    else:
+        midi_bytes.seek(0)
+        midi_payload = midi_bytes.getvalue()
+
+    try:
+        midi_obj: pretty_midi.PrettyMIDI | None = pretty_midi.PrettyMIDI(io.BytesIO(midi_payload))
+    except Exception:
+        midi_obj = None
+
+    return _render_score(
+        midi_obj,
+        midi_payload,
+        soundfont=soundfont,
+        add_vinyl_fx=add_vinyl_fx,
+        instrument_effects=instrument_effects,
+    )
+
+
+def midi_to_audio_from_pm(
+    pm: pretty_midi.PrettyMIDI,
+    *,
+    soundfont: str | None = None,
+    add_vinyl_fx: bool = False,
+    instrument_effects: Mapping[str, Sequence[str]] | None = None,
+) -> AudioSegment:
+    """Render an in-memory score, serialising it only if the FluidSynth executable needs a file."""
+
+    return _render_score(
+        pm,
+        None,
+        soundfont=soundfont,
+        add_vinyl_fx=add_vinyl_fx,
+        instrument_effects=instrument_effects,
+    )
+
+
+def _render_score(
+    midi_obj: pretty_midi.PrettyMIDI | None,
+    midi_payload: bytes | None,
+    *,
+    soundfont: str | None,
+    add_vinyl_fx: bool,
+    instrument_effects: Mapping[str, Sequence[str]] | None,
+) -> AudioSegment:
+    from pydub.exceptions import CouldntDecodeError
 
     if soundfont and not os.path.exists(soundfont):
         raise FileNotFoundError(f"Soundfont not found at {soundfont}")
@@ -443,9 +676,9 @@ def midi_to_audio(
                 "for full audio rendering."
             ),
             RuntimeWarning,
-            stacklevel=2,
+            stacklevel=3,
         )
-        placeholder = _placeholder_audio_from_midi(midi_payload)
+        placeholder = _placeholder_audio(midi_obj)
         return _add_fx_layer(placeholder) if add_vinyl_fx else placeholder
 
     soundfont_path = resolve_soundfont_path(soundfont)
@@ -456,51 +689,54 @@ def midi_to_audio(
             f"Set {SOUNDFONT_ENV_VAR} or place a General MIDI .sf2 next to the app."
         )
 
-    fluidsynth_exec = resolve_fluidsynth_executable()
-    if fluidsynth_exec is None:
-        return _fallback("FluidSynth executable not available.")
-
     effect_map = _normalise_effects_map(instrument_effects)
 
-    try:
-        midi_obj: pretty_midi.PrettyMIDI | None = pretty_midi.PrettyMIDI(io.BytesIO(midi_payload))
-    except Exception:
-        midi_obj = None
+    # Prefer the libfluidsynth binding: it synthesises the parsed score in
+    # process, skipping the subprocess and its MIDI/WAV temp files.
+    synth = _in_process_synth(soundfont_path) if midi_obj is not None else None
+    fluidsynth_exec = resolve_fluidsynth_executable() if synth is None else None
+    if synth is None and fluidsynth_exec is None:
+        return _fallback("FluidSynth executable not available.")
 
-    def _render(payload: bytes) -> AudioSegment:
+    solo_buffer = io.BytesIO()
+
+    def _render(instruments: list[pretty_midi.Instrument] | None = None) -> AudioSegment:
+        if synth is not None:
+            return _render_in_process(midi_obj.instruments if instruments is None else instruments, *synth)
+        if instruments is None and midi_payload is not None:
+            payload = midi_payload
+        else:
+            # Serialise the parsed score, or a solo track swapped onto it, into
+            # one reused buffer rather than re-parsing the payload per instrument.
+            all_instruments = midi_obj.instruments
+            if instruments is not None:
+                midi_obj.instruments = instruments
+            solo_buffer.seek(0)
+            solo_buffer.truncate()
+            try:
+                midi_obj.write(solo_buffer)
+            finally:
+                midi_obj.instruments = all_instruments
+            payload = solo_buffer.getvalue()
         return _render_with_fluidsynth(payload, executable=fluidsynth_exec, soundfont=soundfont_path)
 
     try:
         if not midi_obj or not _effects_required(midi_obj, effect_map):
-            audio = _render(midi_payload)
+            audio = _render()
         else:
             rendered_tracks: list[AudioSegment] = []
-            for index, instrument in enumerate(midi_obj.instruments):
+            for instrument in midi_obj.instruments:
                 resolved_effects = _instrument_effects(instrument, effect_map)
-
-                per_instrument = pretty_midi.PrettyMIDI(io.BytesIO(midi_payload))
-                if index >= len(per_instrument.instruments):
-                    continue
-                solo_instrument = per_instrument.instruments[index]
-                per_instrument.instruments = [solo_instrument]
-
-                solo_buffer = io.BytesIO()
-                per_instrument.write(solo_buffer)
-                solo_payload = solo_buffer.getvalue()
-
-                track_audio = _render(solo_payload)
+                track_audio = _render([instrument])
                 if resolved_effects:
                     track_audio = _apply_effects_chain(track_audio, resolved_effects)
                 rendered_tracks.append(track_audio)
 
             if not rendered_tracks:
-                audio = _render(midi_payload)
+                audio = _render()
             else:
                 rendered_tracks.sort(key=len, reverse=True)
-                mix = rendered_tracks[0]
-                for segment in rendered_tracks[1:]:
-                    mix = mix.overlay(segment)
-                audio = mix
+                audio = overlay_pcm(rendered_tracks[0], *rendered_tracks[1:])
 
         if add_vinyl_fx:
             audio = _add_fx_layer(audio)
@@ -509,24 +745,189 @@ def midi_to_audio(
         return _fallback(f"FluidSynth rendering failed ({exc}).")
 
 
+def overlay_pcm(base: AudioSegment, *layers: AudioSegment, layer_gain_db: float = 0.0) -> AudioSegment:
+    """Mix ``layers`` onto ``base`` as 16-bit PCM in one NumPy pass.
+
+    Like :meth:`AudioSegment.overlay`, the result keeps ``base``'s length;
+    layers are resampled to the widest format, gained, summed and clipped once.
+    """
+
+    from pydub import AudioSegment
+
+    segments = (base, *layers)
+    frame_rate = max(segment.frame_rate for segment in segments)
+    channels = max(segment.channels for segment in segments)
+    base_pcm, *layer_pcms = (
+        np.frombuffer(
+            segment.set_sample_width(2).set_frame_rate(frame_rate).set_channels(channels).raw_data,
+            dtype="<i2",
+        )
+        for segment in segments
+    )
+
+    mix = base_pcm.astype(np.int32)
+    gain = 10 ** (layer_gain_db / 20)
+    for layer_pcm in layer_pcms:
+        span = min(mix.size, layer_pcm.size)
+        if layer_gain_db:
+            mix[:span] += (layer_pcm[:span] * gain).astype(np.int32)
+        else:
+            mix[:span] += layer_pcm[:span]
+    pcm = np.clip(mix, -32768, 32767, out=mix).astype("<i2")
+    return AudioSegment(pcm.tobytes(), frame_rate=frame_rate, sample_width=2, channels=channels)
+
+
+def audio_to_wav_bytes(audio: AudioSegment) -> bytes:
+    """Serialise ``audio`` as a PCM WAV payload in a single allocation."""
+
+    if audio.sample_width == 1:
+        # 8-bit WAV stores unsigned samples, so let pydub handle the bias.
+        buffer = io.BytesIO()
+        audio.export(buffer, format="wav")
+        return buffer.getvalue()
+
+    pcm = audio.raw_data
+    block_align = audio.channels * audio.sample_width
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + len(pcm),
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        audio.channels,
+        audio.frame_rate,
+        audio.frame_rate * block_align,
+        block_align,
+        audio.sample_width * 8,
+        b"data",
+        len(pcm),
+    )
+    return b"".join((header, pcm))
+
+
+_SAMPLE_RATE = 44100
+# One libfluidsynth instance is shared by every render; renders from the
+# background pool take turns on it.
+_SYNTH_LOCK = threading.Lock()
+_SYNTH: object | None = None
+# Soundfonts stay loaded on the shared synth, keyed by path, so switching back
+# to a previously used soundfont costs a dict lookup rather than an SF2 parse.
+_SOUNDFONT_IDS: dict[str, int] = {}
+
+
+def _shared_synth() -> object | None:
+    """Return the shared ``fluidsynth.Synth``, or ``None`` when in-process rendering is unavailable."""
+
+    global _SYNTH
+
+    if _SYNTH is not None:
+        return _SYNTH
+    if importlib.util.find_spec("fluidsynth") is None:
+        return None
+    import pretty_midi
+
+    # Rendering on a shared synth needs the ``synthesizer``/``sfid`` keywords
+    # from pretty_midi 0.2.11; older releases go through the subprocess path.
+    if "synthesizer" not in inspect.signature(pretty_midi.Instrument.fluidsynth).parameters:
+        return None
+    with _SYNTH_LOCK:
+        if _SYNTH is None:
+            try:
+                _SYNTH = importlib.import_module("fluidsynth").Synth(samplerate=float(_SAMPLE_RATE))
+            except (ImportError, OSError):  # pragma: no cover - libfluidsynth missing
+                return None
+        return _SYNTH
+
+
+def in_process_rendering_available() -> bool:
+    """Whether pyfluidsynth loads and pretty_midi can render on a shared synth."""
+
+    return _shared_synth() is not None
+
+
+def _in_process_synth(soundfont: str) -> tuple[object, int] | None:
+    """Return the shared ``(fluidsynth.Synth, sfid)`` pair, or ``None`` without pyfluidsynth."""
+
+    synth = _shared_synth()
+    if synth is None:
+        return None
+    with _SYNTH_LOCK:
+        sfid = _SOUNDFONT_IDS.get(soundfont)
+        if sfid is None:
+            sfid = synth.sfload(soundfont)
+            if sfid == -1:
+                return None
+            _SOUNDFONT_IDS[soundfont] = sfid
+        return synth, sfid
+
+
+def _render_in_process(instruments: Sequence[pretty_midi.Instrument], synth: object, sfid: int) -> AudioSegment:
+    from pydub import AudioSegment
+
+    waveforms = []
+    with _SYNTH_LOCK:
+        for instrument in instruments:
+            if not instrument.notes:
+                continue
+            # pretty_midi plays every instrument on the same channel of the
+            # shared synth, so clear the programs, controllers, pitch bend and
+            # ringing voices left by the previous instrument or render first.
+            synth.system_reset()
+            waveforms.append(instrument.fluidsynth(synthesizer=synth, sfid=sfid))
+    if not waveforms:
+        return AudioSegment.silent(duration=1000, frame_rate=_SAMPLE_RATE)
+
+    mix = np.zeros(max(len(waveform) for waveform in waveforms))
+    for waveform in waveforms:
+        mix[: len(waveform)] += waveform
+    # libfluidsynth hands back 16-bit sample values, so the sum only needs clipping.
+    pcm = np.clip(mix, -32768, 32767).astype("<i2")
+    return AudioSegment(pcm.tobytes(), frame_rate=_SAMPLE_RATE, sample_width=2, channels=1)
+
+
+@functools.lru_cache(maxsize=4)
+def _fluidsynth_streams_stdout(executable: str) -> bool:
+    """Whether ``executable`` can fast-render to stdout (``-q -F -``, FluidSynth 2.1+)."""
+
+    try:
+        result = subprocess.run([executable, "--version"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return False
+    match = re.search(r"version (\d+)\.(\d+)", result.stdout)
+    return bool(match) and (int(match.group(1)), int(match.group(2))) >= (2, 1)
+
+
 def _render_with_fluidsynth(
     midi_payload: bytes, *, executable: str, soundfont: str
 ) -> AudioSegment:
+    from pydub import AudioSegment
+
     with tempfile.NamedTemporaryFile(suffix=".mid", delete=False) as midi_file:
         midi_file.write(midi_payload)
         midi_path = midi_file.name
 
-    wav_path = midi_path.replace(".mid", ".wav")
-    cmd = [executable, "-ni", soundfont, midi_path, "-F", wav_path, "-r", "44100"]
-
     try:
-        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        return AudioSegment.from_file(wav_path)
+        if _fluidsynth_streams_stdout(executable):
+            # Raw little-endian 16-bit stereo straight off the pipe: no WAV is
+            # written to disk only to be read back and parsed.
+            cmd = [executable, "-ni", "-q", "-T", "raw", "-O", "s16", "-E", "little", "-r", str(_SAMPLE_RATE)]
+            cmd += ["-F", "-", soundfont, midi_path]
+            result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            return AudioSegment(result.stdout, frame_rate=_SAMPLE_RATE, sample_width=2, channels=2)
+
+        wav_path = midi_path.replace(".mid", ".wav")
+        cmd = [executable, "-ni", soundfont, midi_path, "-F", wav_path, "-r", str(_SAMPLE_RATE)]
+        try:
+            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            return AudioSegment.from_file(wav_path)
+        finally:
+            if os.path.exists(wav_path):
+                os.remove(wav_path)
     finally:
         if os.path.exists(midi_path):
             os.remove(midi_path)
-        if os.path.exists(wav_path):
-            os.remove(wav_path)
 
 
 def _normalise_effects_map(
@@ -561,6 +962,8 @@ def _effects_required(midi_obj: pretty_midi.PrettyMIDI, effect_map: Mapping[str,
 def _instrument_effects(
     instrument: pretty_midi.Instrument, effect_map: Mapping[str, list[str]]
 ) -> list[str]:
+    import pretty_midi
+
     if not effect_map:
         return []
 
@@ -614,9 +1017,7 @@ def _effect_tape_warmth(audio: AudioSegment) -> AudioSegment:
 
 
 def _effect_vinyl_crackle(audio: AudioSegment) -> AudioSegment:
-    noise = WhiteNoise().to_audio_segment(duration=len(audio), volume=-30)
-    textured = noise.high_pass_filter(1800).low_pass_filter(7200)
-    return audio.overlay(textured)
+    return overlay_pcm(audio, _noise_layer(audio, volume=-30, high_pass=1800, low_pass=7200))
 
 
 def _effect_lush_chorus(audio: AudioSegment) -> AudioSegment:
@@ -645,6 +1046,8 @@ def _effect_lofi_delay(audio: AudioSegment) -> AudioSegment:
 
 
 def _ensure_stereo(audio: AudioSegment) -> AudioSegment:
+    from pydub import AudioSegment
+
     if audio.channels == 2:
         return audio
     return AudioSegment.from_mono_audiosegments(audio, audio)
@@ -71,8 +71,12 @@ class MidiInputManager:
         self._port = None
 
     def drain(self, callback: Callable[[MidiMessage], None]) -> None:
-        while not self._queue.empty():
-            callback(self._queue.get())
+        while True:
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            callback(message)
 
     def __del__(self):  # pragma: no cover - cleanup
         self.stop_listening()
@@ -3,17 +3,77 @@
 from __future__ import annotations
 
 import dataclasses
+import hashlib
+import importlib
+import importlib.util
 import json
+import operator
+import struct
+from collections import Counter
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, List, Sequence
 
 import numpy as np
-import pandas as pd
-import pretty_midi
 
 from .generator import INSTRUMENT_PROGRAMS
 
+if TYPE_CHECKING:  # pragma: no cover - type checking only
+    import pandas as pd
+    import pretty_midi
+
+
+_EVENT_STRUCT = struct.Struct("<ddii")
+_EVENT_ORDER = operator.attrgetter("start", "pitch")
+
+
+@lru_cache(maxsize=None)
+def _optional_module(name: str) -> Any | None:
+    """Return an optional accelerator module such as ``xxhash`` when it is installed."""
+
+    if importlib.util.find_spec(name) is None:
+        return None
+    return importlib.import_module(name)
+
+
+@lru_cache(maxsize=None)
+def _midi_program(instrument: str) -> int:
+    """General MIDI program for a timeline instrument name, ``0`` when unknown."""
+
+    if instrument == "Drums":
+        return 0
+    if instrument in INSTRUMENT_PROGRAMS:
+        return INSTRUMENT_PROGRAMS[instrument]
+
+    import pretty_midi
+
+    try:
+        return pretty_midi.instrument_name_to_program(instrument)
+    except ValueError:
+        return 0
+
+
+def _new_hasher() -> Any:
+    xxhash = _optional_module("xxhash")
+    if xxhash is not None:
+        return xxhash.xxh3_64()
+    return hashlib.blake2b(digest_size=8)
+
+
+def _dump_json(payload: Any) -> bytes:
+    orjson = _optional_module("orjson")
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+
+def _load_json(data: bytes) -> Any:
+    orjson = _optional_module("orjson")
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 @dataclass
 class TimelineEvent:
@@ -44,6 +104,11 @@ class Timeline:
 
     def __init__(self, events: Iterable[TimelineEvent] | None = None) -> None:
         self._events: List[TimelineEvent] = list(events or [])
+        self._max_end = 0.0
+        self._instrument_counts: Counter[str] = Counter()
+        self._hash = _new_hasher()
+        self._display_frame: tuple[int, pd.DataFrame] | None = None
+        self._reindex()
 
     def __iter__(self):  # pragma: no cover - trivial
         return iter(self._events)
@@ -55,75 +120,175 @@ class Timeline:
     def events(self) -> List[TimelineEvent]:
         return list(self._events)
 
+    @property
+    def max_end(self) -> float:
+        """Beat position where the last clip finishes, ``0.0`` when empty."""
+
+        return self._max_end
+
+    def instruments(self) -> List[str]:
+        """Return the sorted names of instruments that have at least one clip."""
+
+        return sorted(self._instrument_counts)
+
+    def signature(self) -> int:
+        """Return a 64-bit digest of the events, maintained as clips are added.
+
+        Two timelines holding the same clips added in a different order may
+        produce different signatures, so use it as a cache key only.
+        """
+
+        return int.from_bytes(self._hash.digest(), "little")
+
+    def _hash_event(self, event: TimelineEvent) -> None:
+        self._hash.update(_EVENT_STRUCT.pack(event.start, event.duration, event.pitch, event.velocity))
+        self._hash.update(event.instrument.encode("utf-8") + b"\0")
+
+    def _reindex(self) -> None:
+        self._max_end = max((event.start + event.duration for event in self._events), default=0.0)
+        self._instrument_counts = Counter(event.instrument for event in self._events)
+        self._hash = _new_hasher()
+        for event in self._events:
+            self._hash_event(event)
+
     def to_dataframe(self) -> pd.DataFrame:
-        data = [event.to_dict() for event in self._events]
-        if not data:
-            return pd.DataFrame(columns=["start", "duration", "pitch", "velocity", "instrument"])
-        return pd.DataFrame(data)
+        import pandas as pd
+
+        events = self._events
+        count = len(events)
+        # Build the frame column by column rather than from one dict per event.
+        return pd.DataFrame(
+            {
+                "start": np.fromiter((event.start for event in events), dtype=np.float64, count=count),
+                "duration": np.fromiter((event.duration for event in events), dtype=np.float64, count=count),
+                "pitch": np.fromiter((event.pitch for event in events), dtype=np.int64, count=count),
+                "velocity": np.fromiter((event.velocity for event in events), dtype=np.int64, count=count),
+                "instrument": pd.Series([event.instrument for event in events], dtype=object),
+            }
+        )
 
     def update_from_dataframe(self, frame: pd.DataFrame) -> None:
-        self._events = [TimelineEvent.from_dict(row) for row in frame.to_dict(orient="records")]
+        self._events = [
+            TimelineEvent(
+                start=float(start),
+                duration=float(duration),
+                pitch=int(pitch),
+                velocity=int(velocity),
+                instrument=str(instrument),
+            )
+            for start, duration, pitch, velocity, instrument in zip(
+                frame["start"].tolist(),
+                frame["duration"].tolist(),
+                frame["pitch"].tolist(),
+                frame["velocity"].tolist(),
+                frame["instrument"].tolist(),
+            )
+        ]
+        self._reindex()
 
     def add_event(self, event: TimelineEvent) -> None:
         self._events.append(event)
-        self._events.sort(key=lambda ev: (ev.start, ev.pitch))
+        self._events.sort(key=_EVENT_ORDER)
+        end = event.start + event.duration
+        if end > self._max_end:
+            self._max_end = end
+        self._instrument_counts[event.instrument] += 1
+        self._hash_event(event)
 
     def extend(self, events: Sequence[TimelineEvent]) -> None:
+        """Add ``events`` in one batch, sorting once instead of after every clip."""
+
+        if not events:
+            return
+        self._events.extend(events)
+        self._events.sort(key=_EVENT_ORDER)
+        self._max_end = max(self._max_end, max(event.start + event.duration for event in events))
+        self._instrument_counts.update(event.instrument for event in events)
         for event in events:
-            self.add_event(event)
+            self._hash_event(event)
+
+    def duplicate_shift(self, offset: float | None = None) -> None:
+        """Append a copy of every clip moved ``offset`` beats later, defaulting to :attr:`max_end`."""
+
+        if offset is None:
+            offset = self._max_end
+        self.extend(
+            [
+                TimelineEvent(event.start + offset, event.duration, event.pitch, event.velocity, event.instrument)
+                for event in self._events
+            ]
+        )
 
     def quantize(self, grid: float = 0.25) -> None:
-        for event in self._events:
-            event.start = float(np.round(event.start / grid) * grid)
-            event.duration = max(grid, float(np.round(event.duration / grid) * grid))
+        events = self._events
+        count = len(events)
+        # Snap all clips in two array operations, then write the results back.
+        starts = np.fromiter((event.start for event in events), dtype=np.float64, count=count)
+        durations = np.fromiter((event.duration for event in events), dtype=np.float64, count=count)
+        starts = np.round(starts / grid) * grid
+        durations = np.maximum(grid, np.round(durations / grid) * grid)
+        for event, start, duration in zip(events, starts.tolist(), durations.tolist()):
+            event.start = start
+            event.duration = duration
+        self._reindex()
+
+    def to_json_bytes(self) -> bytes:
+        """Serialise the events as indented UTF-8 JSON, using ``orjson`` when installed."""
+
+        return _dump_json([event.to_dict() for event in self._events])
+
+    @classmethod
+    def from_json_bytes(cls, data: bytes) -> "Timeline":
+        """Build a timeline from a JSON payload produced by :meth:`to_json_bytes`."""
+
+        return cls([TimelineEvent.from_dict(event) for event in _load_json(data)])
 
     def to_json(self, path: Path) -> Path:
-        payload = [event.to_dict() for event in self._events]
-        path.write_text(json.dumps(payload, indent=2))
+        path.write_bytes(self.to_json_bytes())
         return path
 
     @classmethod
     def from_json(cls, path: Path) -> "Timeline":
-        payload = json.loads(path.read_text())
-        return cls(TimelineEvent.from_dict(event) for event in payload)
+        return cls.from_json_bytes(path.read_bytes())
 
     def to_pretty_midi(self, tempo: int) -> pretty_midi.PrettyMIDI:
+        import pretty_midi
+
         midi = pretty_midi.PrettyMIDI(initial_tempo=tempo)
-        grouped: dict[str, pretty_midi.Instrument] = {}
+        grouped: dict[str, list[TimelineEvent]] = {}
         for event in self._events:
-            if event.instrument == "Drums":
-                program = 0
-                is_drum = True
-            else:
-                is_drum = False
-                if event.instrument in INSTRUMENT_PROGRAMS:
-                    program = INSTRUMENT_PROGRAMS[event.instrument]
-                else:
-                    try:
-                        program = pretty_midi.instrument_name_to_program(event.instrument)
-                    except ValueError:
-                        program = 0
-            instrument = grouped.get(event.instrument)
-            if instrument is None:
-                instrument = pretty_midi.Instrument(program=program, is_drum=is_drum, name=event.instrument)
-                grouped[event.instrument] = instrument
-                midi.instruments.append(instrument)
-            elif not instrument.name:
-                instrument.name = event.instrument
-
-            note = pretty_midi.Note(
-                start=event.start,
-                end=event.start + event.duration,
-                velocity=event.velocity,
-                pitch=event.pitch,
-            )
-            instrument.notes.append(note)
+            grouped.setdefault(event.instrument, []).append(event)
+
+        # One pass per instrument: resolve its program once, then build every
+        # note from column lists with a positional map().
+        for name, events in grouped.items():
+            instrument = pretty_midi.Instrument(program=_midi_program(name), is_drum=name == "Drums", name=name)
+            starts = [event.start for event in events]
+            ends = [event.start + event.duration for event in events]
+            velocities = [event.velocity for event in events]
+            pitches = [event.pitch for event in events]
+            instrument.notes = list(map(pretty_midi.Note, velocities, pitches, starts, ends))
+            midi.instruments.append(instrument)
         return midi
 
 
 def dataframe_for_display(timeline: Timeline) -> pd.DataFrame:
+    """Return the editor frame for ``timeline``, rebuilt only when its signature changes.
+
+    Callers get a copy of the cached frame, so editing it never leaks into
+    later calls. Change events through :class:`Timeline` methods so the
+    signature moves with them.
+    """
+
+    signature = timeline.signature()
+    cached = timeline._display_frame
+    if cached is not None and cached[0] == signature:
+        return cached[1].copy()
+
     frame = timeline.to_dataframe()
     if frame.empty:
+        import pandas as pd
+
         frame = pd.DataFrame(
             [
                 {
@@ -135,4 +300,5 @@ def dataframe_for_display(timeline: Timeline) -> pd.DataFrame:
                 }
             ]
         )
-    return frame
+    timeline._display_frame = (signature, frame)
+    return frame.copy()
@@ -0,0 +1,91 @@
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+from lofi_symphony import app
+from lofi_symphony.timeline import Timeline, TimelineEvent
+
+
+def _event(start):
+    return TimelineEvent(start=start, duration=0.5, pitch=60, velocity=90, instrument="Piano")
+
+
+class _SessionState(dict):
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+@pytest.fixture
+def session(monkeypatch):
+    state = _SessionState()
+    monkeypatch.setattr(app, "st", SimpleNamespace(session_state=state))
+    return state
+
+
+def test_shift_uses_first_containing_section_when_sections_overlap(session):
+    bar = app.BEATS_PER_BAR
+    # "B" sits inside "A" and is listed after it; "C" shares B's start bar.
+    sections = [
+        {"name": "A", "start_bar": 0, "n_bars": 8},
+        {"name": "B", "start_bar": 2, "n_bars": 2},
+        {"name": "C", "start_bar": 2, "n_bars": 6},
+        {"name": "D", "start_bar": 10, "n_bars": 2},
+    ]
+    session.timeline = Timeline([_event(1 * bar), _event(3 * bar), _event(5 * bar), _event(9 * bar), _event(11 * bar)])
+
+    app._shift_timeline_sections(sections, {"A": 1.0, "B": 10.0, "C": 20.0, "D": -40.0})
+
+    assert [event.start for event in session.timeline.events] == [
+        1 * bar + 1.0,
+        3 * bar + 1.0,
+        5 * bar + 1.0,
+        9 * bar,
+        0.0,
+    ]
+
+
+def test_playback_timeline_reused_until_the_mix_changes(session):
+    session.arrangement_sections = None
+    session.arranger_tracks = [{"instrument": "Piano", "enabled": True, "volume": 50, "pan": 0, "effects": []}]
+    timeline = Timeline([_event(0.0), _event(1.0)])
+
+    playback = app._arranger_filtered_timeline(timeline)
+    assert [event.velocity for event in playback.events] == [45, 45]
+    assert app._arranger_filtered_timeline(timeline) is playback
+
+    session.arranger_tracks[0]["volume"] = 100
+    assert [event.velocity for event in app._arranger_filtered_timeline(timeline).events] == [90, 90]
+
+    session.arranger_tracks[0]["enabled"] = False
+    assert not app._arranger_filtered_timeline(timeline).events
+
+
+def test_background_jobs_reuse_finished_results_and_retry_failures():
+    jobs = app._BackgroundJobs(max_entries=2)
+    calls = []
+
+    def job(value):
+        calls.append(value)
+        if value == "boom":
+            raise RuntimeError(value)
+        return value
+
+    first = jobs.submit("a", job, "a")
+    assert first.result() == "a"
+    assert jobs.submit("a", job, "a") is first
+
+    failed = jobs.submit("b", job, "boom")
+    assert isinstance(failed.exception(), RuntimeError)
+    assert jobs.submit("b", job, "boom") is not failed
+
+    rejected = jobs.submit("c", job, "c", validate=lambda result: False)
+    rejected.result()
+    assert jobs.submit("c", job, "c", validate=lambda result: False) is not rejected
+
+    # Only the two most recent keys are kept, so "a" has been evicted.
+    jobs.submit("a", job, "a").result()
+    assert calls == ["a", "boom", "boom", "c", "c", "a"]
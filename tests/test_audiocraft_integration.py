@@ -1,5 +1,7 @@
 from pathlib import Path
 import sys
+import threading
+import time
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
 
@@ -20,18 +22,28 @@ class DummyMusicGenModel:
 
 class DummyMusicGenModule:
     call_count = 0
+    device = None
 
     class MusicGen:
         @staticmethod
-        def get_pretrained(name, progress=True):
+        def get_pretrained(name, progress=True, device=None):
             DummyMusicGenModule.call_count += 1
+            DummyMusicGenModule.device = device
             assert progress is True
             return DummyMusicGenModel()
 
 
+class DummyTorch:
+    class cuda:
+        @staticmethod
+        def is_available():
+            return False
+
+
 def _reset_loader():
     ai.clear_cached_musicgen()
     DummyMusicGenModule.call_count = 0
+    DummyMusicGenModule.device = None
 
 
 def test_ensure_musicgen_assets_missing_module(monkeypatch):
@@ -50,6 +62,8 @@ def test_ensure_musicgen_assets_downloads_once(monkeypatch):
     _reset_loader()
 
     def fake_import(name):
+        if name == 'torch':
+            return DummyTorch
         assert name == 'audiocraft.models.musicgen'
         return DummyMusicGenModule
 
@@ -59,3 +73,123 @@ def test_ensure_musicgen_assets_downloads_once(monkeypatch):
     ai.ensure_musicgen_assets()
 
     assert DummyMusicGenModule.call_count == 1
+    assert DummyMusicGenModule.device == 'cpu'
+
+
+def test_concurrent_loads_share_one_download(monkeypatch):
+    _reset_loader()
+    started = threading.Event()
+
+    class SlowMusicGenModule:
+        class MusicGen:
+            @staticmethod
+            def get_pretrained(name, progress=True, device=None):
+                started.set()
+                time.sleep(0.05)
+                return DummyMusicGenModule.MusicGen.get_pretrained(name, progress=progress, device=device)
+
+    def fake_import(name):
+        if name == 'torch':
+            return DummyTorch
+        return SlowMusicGenModule
+
+    monkeypatch.setattr(ai.importlib, 'import_module', fake_import)
+
+    download = threading.Thread(target=ai.ensure_musicgen_assets)
+    download.start()
+    started.wait()
+    model = ai._load_musicgen(ai.DEFAULT_MUSICGEN_MODEL)
+    download.join()
+
+    assert DummyMusicGenModule.call_count == 1
+    assert ai._load_musicgen(ai.DEFAULT_MUSICGEN_MODEL) is model
+
+
+def test_generation_params_only_reapplied_when_changed():
+    _reset_loader()
+    model = DummyMusicGenModel()
+
+    ai._apply_generation_params(model, (12.0, 250, 0.0, 1.0, 3.5))
+    model.params = None
+    ai._apply_generation_params(model, (12.0, 250, 0.0, 1.0, 3.5))
+    assert model.params is None
+
+    ai._apply_generation_params(model, (6.0, 250, 0.0, 1.0, 3.5))
+    assert model.params['duration'] == 6.0
+
+
+def test_reloaded_model_gets_default_generation_params(monkeypatch):
+    _reset_loader()
+
+    def fake_import(name):
+        if name == 'torch':
+            return DummyTorch
+        return DummyMusicGenModule
+
+    monkeypatch.setattr(ai.importlib, 'import_module', fake_import)
+
+    first = ai._load_musicgen('facebook/musicgen-small')
+    ai._apply_generation_params(first, (6.0, 250, 0.0, 1.0, 3.5))
+
+    # Loading a different checkpoint evicts the first; the new instance must be
+    # configured even though the same parameters were applied to the old one.
+    second = ai._load_musicgen('facebook/musicgen-medium')
+    assert second is not first
+    assert second.params['duration'] == 12.0
+
+    ai._apply_generation_params(second, (6.0, 250, 0.0, 1.0, 3.5))
+    assert second.params['duration'] == 6.0
+
+
+def test_precision_applied_on_cuda_only(monkeypatch):
+    _reset_loader()
+
+    class Device:
+        def __init__(self, type):
+            self.type = type
+
+    class LM:
+        dtype = 'float16'
+
+        def to(self, dtype):
+            self.dtype = dtype
+
+    class TorchAutocast:
+        def __init__(self, enabled, device_type, dtype):
+            self.dtype = dtype
+
+    class AutocastModule:
+        pass
+
+    AutocastModule.TorchAutocast = TorchAutocast
+
+    class CudaTorch:
+        float16 = 'float16'
+        bfloat16 = 'bfloat16'
+
+        class cuda:
+            @staticmethod
+            def is_bf16_supported():
+                return True
+
+    monkeypatch.setattr(ai.importlib, 'import_module', lambda name: AutocastModule)
+
+    cpu_model = DummyMusicGenModel()
+    cpu_model.device, cpu_model.lm = Device('cpu'), LM()
+    ai._apply_precision(cpu_model, 'bfloat16', CudaTorch)
+    assert cpu_model.lm.dtype == 'float16'
+
+    gpu_model = DummyMusicGenModel()
+    gpu_model.device, gpu_model.lm = Device('cuda'), LM()
+    ai._apply_precision(gpu_model, 'bfloat16', CudaTorch)
+    assert gpu_model.lm.dtype == 'bfloat16'
+    assert gpu_model.autocast.dtype == 'bfloat16'
+
+    with pytest.raises(ValueError):
+        ai._apply_precision(gpu_model, 'int4', CudaTorch)
+
+    # A reloaded model starts back at float16 and must be cast again.
+    reloaded = DummyMusicGenModel()
+    reloaded.device, reloaded.lm = Device('cuda'), LM()
+    ai._apply_precision(reloaded, 'bfloat16', CudaTorch)
+    assert reloaded.lm.dtype == 'bfloat16'
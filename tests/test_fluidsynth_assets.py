@@ -13,6 +13,13 @@ import pytest
 from lofi_symphony import fluidsynth_assets as assets
 
 
+@pytest.fixture(autouse=True)
+def _fresh_asset_caches():
+    assets.clear_asset_caches()
+    yield
+    assets.clear_asset_caches()
+
+
 @pytest.fixture
 def fake_vendor_root(tmp_path, monkeypatch):
     vendor_root = tmp_path / "_vendor"
@@ -66,10 +73,23 @@ def test_iter_bundled_soundfonts(fake_vendor_root):
     soundfont_dir.mkdir(parents=True)
     sf2_path = soundfont_dir / "TimGM6mb.sf2"
     sf2_path.write_text("")
+    (soundfont_dir / "README.txt").write_text("")
+    (soundfont_dir / "nested.sf2").mkdir()
 
     assert list(assets.iter_bundled_soundfonts()) == [sf2_path]
 
 
+def test_iter_user_soundfonts_sorted_and_missing_dir(fake_vendor_root):
+    assert list(assets._iter_user_soundfonts()) == []
+
+    user_dir = assets._USER_SOUNDFONT_DIR
+    user_dir.mkdir(parents=True)
+    for name in ("b.sf3", "a.sf2", "notes.txt"):
+        (user_dir / name).write_text("")
+
+    assert list(assets._iter_user_soundfonts()) == [user_dir / "a.sf2", user_dir / "b.sf3"]
+
+
 def test_resolve_fluidsynth_prefers_env_override(tmp_path, monkeypatch):
     override_path = tmp_path / "custom" / "fluidsynth.exe"
     override_path.parent.mkdir()
@@ -136,6 +156,29 @@ def test_resolve_soundfont_picks_user_directory(tmp_path, fake_vendor_root):
     assert assets.resolve_soundfont_path() == str(user_font)
 
 
+def test_resolve_soundfont_rescans_after_a_miss(tmp_path, monkeypatch):
+    font_path = tmp_path / "default.sf2"
+    monkeypatch.setattr(
+        assets, "_iter_soundfont_candidates", lambda preferred: [font_path] if font_path.exists() else []
+    )
+    assert assets.resolve_soundfont_path() is None
+
+    font_path.write_text("")
+
+    assert assets.resolve_soundfont_path() == str(font_path)
+
+
+def test_resolve_fluidsynth_rescans_after_a_miss(tmp_path, monkeypatch):
+    exe_path = tmp_path / "fluidsynth"
+    monkeypatch.setattr(assets, "_iter_configured_locations", lambda: [exe_path])
+    monkeypatch.setattr(assets.shutil, "which", lambda exe: None)
+    assert assets.resolve_fluidsynth_executable() is None
+
+    exe_path.write_text("")
+
+    assert assets.resolve_fluidsynth_executable() == str(exe_path)
+
+
 def test_recommended_soundfonts_expose_curated_list():
     sources = assets.recommended_soundfonts()
     assert {source.slug for source in sources} >= {"timgm6mb", "fluidr3mono"}
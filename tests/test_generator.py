@@ -0,0 +1,65 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import numpy as np
+import pretty_midi
+import pytest
+from music21 import chord
+
+from lofi_symphony import generator
+
+
+@pytest.mark.parametrize("key", ["C", "F#", "Bb", "Cb", "B#", "Fb", "E#"])
+@pytest.mark.parametrize("mode", ["major", "minor"])
+def test_chord_pitches_match_music21_for_enharmonic_keys(key, mode):
+    musical_key = generator._music_key(key, mode)
+    romans = {roman for progressions in generator.TYPE_PROGRESSIONS.values() for prog in progressions for roman in prog}
+
+    for roman in romans:
+        expected = tuple(
+            int(round(pitch.midi)) for pitch in chord.Chord(musical_key.romanNumeral(roman).pitches).pitches
+        )
+        assert generator._get_chord_pitches(roman, musical_key) == expected, roman
+
+
+class _StubSynth:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def sfload(self, path):
+        self.calls.append("sfload")
+        return 1
+
+    def system_reset(self):
+        self.calls.append("reset")
+
+
+def test_in_process_render_resets_shared_synth_per_instrument(tmp_path, monkeypatch):
+    synth = _StubSynth()
+    monkeypatch.setattr(generator, "_shared_synth", lambda: synth)
+    monkeypatch.setattr(generator, "_SOUNDFONT_IDS", {})
+    monkeypatch.setattr(generator, "resolve_fluidsynth_executable", pytest.fail)
+
+    def fake_fluidsynth(instrument, synthesizer, sfid):
+        assert synthesizer is synth and sfid == 1
+        synth.calls.append(f"program {instrument.program}")
+        return np.full(generator._SAMPLE_RATE, 1000.0)
+
+    monkeypatch.setattr(pretty_midi.Instrument, "fluidsynth", fake_fluidsynth)
+    soundfont = tmp_path / "font.sf2"
+    soundfont.write_bytes(b"")
+
+    score = pretty_midi.PrettyMIDI()
+    for program in (0, 33):
+        instrument = pretty_midi.Instrument(program=program)
+        instrument.notes.append(pretty_midi.Note(velocity=90, pitch=60, start=0.0, end=0.5))
+        score.instruments.append(instrument)
+    score.instruments.append(pretty_midi.Instrument(program=48))
+
+    for _ in range(2):
+        audio = generator.midi_to_audio_from_pm(score, soundfont=str(soundfont))
+        assert audio.max == 2000
+
+    assert synth.calls == ["sfload"] + ["reset", "program 0", "reset", "program 33"] * 2
@@ -0,0 +1,124 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pytest
+
+from lofi_symphony.timeline import Timeline, TimelineEvent, dataframe_for_display
+
+
+def _event(start, duration, pitch=60, instrument="Piano"):
+    return TimelineEvent(start=start, duration=duration, pitch=pitch, velocity=90, instrument=instrument)
+
+
+def test_max_end_tracks_added_events():
+    timeline = Timeline()
+    assert timeline.max_end == 0.0
+
+    timeline.add_event(_event(1.0, 0.5))
+    timeline.extend([_event(4.0, 2.0), _event(0.0, 1.0)])
+
+    assert timeline.max_end == pytest.approx(6.0)
+
+
+def test_max_end_recomputed_after_quantize_and_dataframe_edit():
+    timeline = Timeline([_event(0.1, 0.3), _event(2.9, 0.9)])
+    timeline.quantize(1.0)
+
+    assert timeline.max_end == pytest.approx(4.0)
+
+    frame = timeline.to_dataframe().iloc[:1]
+    timeline.update_from_dataframe(frame)
+
+    assert timeline.max_end == pytest.approx(1.0)
+
+
+def test_instruments_follow_added_and_replaced_events():
+    timeline = Timeline([_event(0.0, 1.0, instrument="Piano")])
+    timeline.add_event(_event(1.0, 1.0, instrument="Bass"))
+    timeline.add_event(_event(2.0, 1.0, instrument="Bass"))
+
+    assert timeline.instruments() == ["Bass", "Piano"]
+
+    frame = timeline.to_dataframe()
+    timeline.update_from_dataframe(frame[frame["instrument"] == "Bass"])
+
+    assert timeline.instruments() == ["Bass"]
+
+
+def test_signature_tracks_added_and_rewritten_events():
+    events = [_event(0.0, 1.0), _event(1.25, 0.5, instrument="Bass")]
+    timeline = Timeline(events[:1])
+    timeline.add_event(events[1])
+
+    assert timeline.signature() == Timeline(events).signature()
+
+    before = timeline.signature()
+    timeline.quantize(1.0)
+
+    assert timeline.signature() != before
+    assert Timeline().signature() != before
+
+
+def test_json_bytes_round_trip(tmp_path):
+    timeline = Timeline([_event(0.0, 1.0), _event(2.0, 0.5, pitch=48, instrument="Bass")])
+
+    restored = Timeline.from_json_bytes(timeline.to_json_bytes())
+    assert restored.events == timeline.events
+
+    path = timeline.to_json(tmp_path / "timeline.json")
+    assert Timeline.from_json(path).events == timeline.events
+
+
+def test_display_frame_reused_until_timeline_changes():
+    timeline = Timeline([_event(0.0, 1.0)])
+
+    frame = dataframe_for_display(timeline)
+    frame.loc[0, "pitch"] = 12
+    assert dataframe_for_display(timeline)["pitch"].tolist() == [60]
+
+    timeline.add_event(_event(1.0, 1.0, instrument="Bass"))
+    updated = dataframe_for_display(timeline)
+
+    assert updated["instrument"].tolist() == ["Piano", "Bass"]
+
+
+def test_display_frame_follows_edited_events():
+    timeline = Timeline([_event(0.1, 1.0), _event(1.0, 1.0, instrument="Bass")])
+    assert dataframe_for_display(timeline)["start"].tolist() == [0.1, 1.0]
+
+    timeline.quantize(0.5)
+    assert dataframe_for_display(timeline)["start"].tolist() == [0.0, 1.0]
+
+    edited = timeline.to_dataframe()
+    edited.loc[1, "pitch"] = 43
+    timeline.update_from_dataframe(edited)
+    assert dataframe_for_display(timeline)["pitch"].tolist() == [60, 43]
+
+
+def test_duplicate_shift_appends_copies_after_max_end():
+    timeline = Timeline([_event(0.0, 1.0), _event(1.0, 2.0, pitch=48, instrument="Bass")])
+    timeline.duplicate_shift()
+
+    assert [(event.start, event.pitch) for event in timeline.events] == [(0.0, 60), (1.0, 48), (3.0, 60), (4.0, 48)]
+    assert timeline.max_end == pytest.approx(6.0)
+    assert timeline.instruments() == ["Bass", "Piano"]
+
+
+def test_to_pretty_midi_groups_events_per_instrument():
+    timeline = Timeline(
+        [
+            _event(0.0, 1.0, pitch=60, instrument="Piano"),
+            _event(0.5, 0.25, pitch=36, instrument="Drums"),
+            _event(1.0, 2.0, pitch=40, instrument="Bass"),
+            _event(2.0, 0.5, pitch=64, instrument="Piano"),
+        ]
+    )
+
+    midi = timeline.to_pretty_midi(90)
+    tracks = {instrument.name: instrument for instrument in midi.instruments}
+
+    assert list(tracks) == ["Piano", "Drums", "Bass"]
+    assert tracks["Drums"].is_drum and not tracks["Bass"].is_drum
+    assert [(note.start, note.end, note.pitch) for note in tracks["Piano"].notes] == [(0.0, 1.0, 60), (2.0, 2.5, 64)]